@@ -0,0 +1,29 @@
+import gc
+import os
+
+from peekguard.utils.analyzer import clear_model_ready, preload_nlp_engine
+from peekguard.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8045)}"
+# Every worker shares the parent's spaCy model, but still holds its own
+# registry, DLP client and caches
+workers = int(os.environ.get("PEEKGUARD_WORKERS", 3))
+worker_class = "peekguard.workers.PeekguardWorker"
+preload_app = True
+loglevel = "error"
+
+
+def on_starting(server):
+    """Loads the NLP engine once in the master so forked workers share it."""
+    # A sentinel from an earlier run must not let workers skip the load lock
+    clear_model_ready()
+    try:
+        preload_nlp_engine()
+    except Exception as e:
+        # Workers fall back to loading the model themselves
+        logger.error("Failed to preload NLP engine: %s", e, exc_info=True)
+
+    # Keep the collector from touching (and so un-sharing) preloaded objects
+    gc.freeze()
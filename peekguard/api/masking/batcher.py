@@ -0,0 +1,235 @@
+import asyncio
+from collections.abc import Sequence
+from concurrent.futures import Future
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine, RecognizerResult
+
+from peekguard.utils.dlp_recognizer import (
+    GoogleDlpRecognizer,
+    record_dlp_failure,
+    track_dlp_failures,
+)
+from peekguard.utils.logger import get_logger
+
+# How long the first request of a batch waits for company, and the batch cap
+BATCH_MAX_WAIT_S = 0.005
+BATCH_MAX_SIZE = 32
+
+logger = get_logger(__name__)
+
+# Requests can only share an analyzer call when all of these match
+BatchKey = tuple[int, str, tuple[str, ...], float]
+
+
+@dataclass(slots=True)
+class _PendingAnalysis:
+    analyzer: AnalyzerEngine
+    text: str
+    language: str
+    entities: tuple[str, ...]
+    score_threshold: float
+    future: asyncio.Future[list[RecognizerResult]] = field(repr=False)
+    # DLP errors swallowed while analyzing the batch this request was part of
+    dlp_failures: list[BaseException] = field(default_factory=list, repr=False)
+
+    @property
+    def key(self) -> BatchKey:
+        return (id(self.analyzer), self.language, self.entities, self.score_threshold)
+
+
+# A DLP recognizer and its batch results being fetched on the event loop
+DlpBatch = tuple[GoogleDlpRecognizer, Future[list[list[RecognizerResult]]]]
+
+
+def _dlp_recognizers(
+    analyzer: AnalyzerEngine, language: str
+) -> list[GoogleDlpRecognizer]:
+    return [
+        recognizer
+        for recognizer in analyzer.registry.recognizers
+        if isinstance(recognizer, GoogleDlpRecognizer)
+        and recognizer.supported_language == language
+    ]
+
+
+def _run_batch(
+    analyzer: AnalyzerEngine,
+    texts: list[str],
+    language: str,
+    entities: tuple[str, ...],
+    score_threshold: float,
+    dlp_batches: Sequence[DlpBatch] = (),
+) -> list[list[RecognizerResult]]:
+    """Analyze *texts* with a single batched spaCy pass (runs in a worker thread).
+
+    DLP recognizers in *dlp_batches* answer from their pending batch instead of
+    calling DLP once per text.
+    """
+    with ExitStack() as stack:
+        for recognizer, future in dlp_batches:
+            stack.enter_context(recognizer.results_from(texts, future))
+
+        if len(texts) == 1:
+            return [
+                analyzer.analyze(
+                    text=texts[0],
+                    language=language,
+                    entities=list(entities),
+                    score_threshold=score_threshold,
+                )
+            ]
+        return BatchAnalyzerEngine(analyzer).analyze_iterator(
+            texts,
+            language=language,
+            batch_size=len(texts),
+            entities=list(entities),
+            score_threshold=score_threshold,
+        )
+
+
+class AnalysisBatcher:
+    """Coalesces concurrent analyzer calls into micro-batches.
+
+    Requests arriving within `max_wait` seconds of each other (up to
+    `max_batch_size`) that share analyzer, language, entities and threshold
+    are analyzed together, so spaCy tokenizes them in one ``nlp.pipe`` call.
+
+    :param max_wait: Seconds the first request of a batch waits for others
+    :param max_batch_size: Maximum number of requests drained into one batch
+    """
+
+    def __init__(
+        self,
+        max_wait: float = BATCH_MAX_WAIT_S,
+        max_batch_size: int = BATCH_MAX_SIZE,
+    ) -> None:
+        self._max_wait = max_wait
+        self._max_batch_size = max_batch_size
+        self._queue: asyncio.Queue[_PendingAnalysis] | None = None
+        self._drain_task: asyncio.Task[None] | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._drain_task is not None and not self._drain_task.done()
+
+    def start(self) -> None:
+        """Start draining the queue on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._drain_task = asyncio.create_task(self._drain(), name="analysis-batcher")
+
+    async def stop(self) -> None:
+        """Stop draining and cancel every request that has not been analyzed yet."""
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+            self._drain_task = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+            self._queue = None
+
+    async def submit(
+        self,
+        analyzer: AnalyzerEngine,
+        text: str,
+        language: str,
+        entities: list[str],
+        score_threshold: float,
+    ) -> list[RecognizerResult]:
+        """Queue *text* for analysis and wait for its results."""
+        if not self.running or self._queue is None:
+            raise RuntimeError("AnalysisBatcher is not running")
+
+        future: asyncio.Future[list[RecognizerResult]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        pending = _PendingAnalysis(
+            analyzer, text, language, tuple(entities), score_threshold, future
+        )
+        self._queue.put_nowait(pending)
+        results = await future
+        # The batch ran in the batcher's context; report its failures in ours
+        for error in pending.dlp_failures:
+            record_dlp_failure(error)
+        return results
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            groups: dict[BatchKey, list[_PendingAnalysis]] = {}
+            for pending in batch:
+                if not pending.future.cancelled():
+                    groups.setdefault(pending.key, []).append(pending)
+
+            # Analysis runs in the background so the next batch can gather meanwhile
+            for group in groups.values():
+                task = asyncio.create_task(self._analyze_group(group))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    @staticmethod
+    async def _analyze_group(group: list[_PendingAnalysis]) -> None:
+        first = group[0]
+        texts = [pending.text for pending in group]
+        # DLP is awaited on the event loop while the worker thread runs spaCy
+        # and the local recognizers, which then wait for its findings
+        loop = asyncio.get_running_loop()
+        dlp_batches = [
+            (
+                recognizer,
+                asyncio.run_coroutine_threadsafe(
+                    recognizer.analyze_batch_async(texts, list(first.entities)), loop
+                ),
+            )
+            for recognizer in _dlp_recognizers(first.analyzer, first.language)
+        ]
+        try:
+            with track_dlp_failures() as dlp_failures:
+                results = await asyncio.to_thread(
+                    _run_batch,
+                    first.analyzer,
+                    texts,
+                    first.language,
+                    first.entities,
+                    first.score_threshold,
+                    dlp_batches,
+                )
+            # strict: a short result list must fail its requests, not leave them waiting
+            for pending, result in zip(group, results, strict=True):
+                if not pending.future.done():
+                    pending.dlp_failures = dlp_failures
+                    pending.future.set_result(result)
+        except Exception as e:
+            logger.error("Batched analysis of %d texts failed: %s", len(group), e)
+            for pending in group:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        finally:
+            for _, future in dlp_batches:
+                future.cancel()
+
+        logger.info("Analyzed a batch of %d texts.", len(group))
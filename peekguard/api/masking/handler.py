@@ -1,31 +1,119 @@
+import asyncio
+import logging
 import re
+import sys
 import time
-from collections import defaultdict
-
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cache
+from itertools import accumulate
+from operator import itemgetter
+from types import MappingProxyType
+
+import orjson
 import pyap
 from fastapi import HTTPException
 from presidio_analyzer import AnalyzerEngine, RecognizerResult
 
+from peekguard.api.masking.batcher import AnalysisBatcher
 from peekguard.utils.alerts import send_alert
+from peekguard.utils.cache import LRUCache
+from peekguard.utils.dlp_recognizer import track_dlp_failures
 from peekguard.utils.logger import get_logger
-from peekguard.utils.entities import PRESIDIO_ENTITIES
+from peekguard.utils.entities import PRESIDIO_ENTITIES_DEFAULT, PRESIDIO_ENTITIES_SET
 
 
 PLACEHOLDER_REGEX = r"<([A-Z0-9_]+)_(\d+)>"
 MIN_THRESHOLD=0.6
 
+# Bounds for the cache of complete mask results; size is counted in characters
+MASK_CACHE_MAX_ENTRIES = 4096
+MASK_CACHE_MAX_CHARS = 32 * 1024 * 1024
+# Bounds for the cache of raw analyzer results per (text, entities, language)
+ANALYZE_CACHE_MAX_ENTRIES = 2048
+ANALYZE_CACHE_MAX_CHARS = 16 * 1024 * 1024
+
+# Characters allowed in the entity part of PLACEHOLDER_REGEX
+_PLACEHOLDER_ENTITY_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+# Default entities left for Presidio once pyap has found the addresses
+_DEFAULT_NON_LOCATION = tuple(
+    entity for entity in PRESIDIO_ENTITIES_DEFAULT if entity != "LOCATION"
+)
+
+# Texts shorter than this cannot contain any supported entity
+MIN_ANALYZABLE_LENGTH = 2
+
+# Entities whose recognizers can only match text containing a digit
+_DIGIT_ENTITIES = frozenset({"CREDIT_CARD", "PHONE_NUMBER", "US_SSN"})
+_DIGIT_RE = re.compile(r"\d")
+_ALNUM_RE = re.compile(r"[^\W_]")
+
+# (start, end, entity, original_value) of a PII span in the unmasked text
+Detection = tuple[int, int, str, str]
+
 logger = get_logger(__name__)
 
 
+def _parse_placeholder(placeholder: str) -> tuple[str, int] | None:
+    """Split a placeholder into ``(entity, number)``, or None if malformed.
+
+    Equivalent to ``re.fullmatch(PLACEHOLDER_REGEX, placeholder)`` but done
+    with plain string operations, as it runs once per existing mapping.
+    """
+    if not (placeholder.startswith("<") and placeholder.endswith(">")):
+        return None
+    entity, _, number = placeholder[1:-1].rpartition("_")
+    if (
+        not entity
+        or not number.isdecimal()
+        or not _PLACEHOLDER_ENTITY_CHARS.issuperset(entity)
+    ):
+        return None
+    return entity, int(number)
+
+
+def _canonical_entity(entity: str) -> str:
+    """Return the interned copy of a known entity name, else *entity* itself.
+
+    Only names from PRESIDIO_ENTITIES are interned: on Python 3.12 interned
+    strings are immortal, so interning arbitrary client input would leak.
+    """
+    return sys.intern(entity) if entity in PRESIDIO_ENTITIES_SET else entity
+
+
+@cache
+def _placeholder_prefix(entity: str) -> str:
+    """Return ``"<ENTITY_"``, built once per entity type for the whole process."""
+    return f"<{entity}_"
+
+
 class PlaceholderManager:
     """Keeps the bi‑directional mapping: ``(entity, value) ⇄ placeholder``."""
 
+    # Built for every request, so instances carry no __dict__
+    __slots__ = ("_placeholder_to_pii", "_pii_to_placeholder", "_entity_counters")
+
     def __init__(self, existing: dict[str, str] | None) -> None:
-        self._placeholder_to_pii: dict[str, str] = dict(existing or {})
+        self._setup(dict(existing or {}))
+
+    @classmethod
+    def _from_owned(cls, existing: dict[str, str] | None) -> "PlaceholderManager":
+        """Build a manager that takes ownership of *existing* instead of copying it.
+
+        The caller must not use *existing* afterwards: new mappings are
+        added to it in place.
+        """
+        pm = cls.__new__(cls)
+        pm._setup(existing if existing is not None else {})
+        return pm
+
+    def _setup(self, placeholder_to_pii: dict[str, str]) -> None:
+        self._placeholder_to_pii: dict[str, str] = placeholder_to_pii
         self._pii_to_placeholder: dict[tuple[str, str], str] = {}
-        self._entity_counters: dict[str, int] = defaultdict(int)
+        self._entity_counters: dict[str, int] = {}
 
-        self._placeholder_re = re.compile(PLACEHOLDER_REGEX)
         self._initialise_from_existing()
 
     # ---------------------------------------------------------------------
@@ -35,21 +123,27 @@ class PlaceholderManager:
     def placeholder_for(self, entity: str, value: str) -> str:
         """Return the *deterministic* placeholder for an (entity, value) pair."""
         key = (entity, value)
-        if key in self._pii_to_placeholder:
-            return self._pii_to_placeholder[key]
+        placeholder = self._pii_to_placeholder.get(key)
+        if placeholder is not None:
+            return placeholder
 
-        self._entity_counters[entity] += 1
-        placeholder = f"<{entity}_{self._entity_counters[entity]}>"
+        number = self._entity_counters.get(entity, 0) + 1
+        self._entity_counters[entity] = number
+        placeholder = _placeholder_prefix(entity) + str(number) + ">"
 
         # Book‑keeping
         self._pii_to_placeholder[key] = placeholder
         self._placeholder_to_pii[placeholder] = value
         return placeholder
 
+    def is_known_placeholder(self, text: str) -> bool:
+        """Return whether *text* is a placeholder already present in the mappings."""
+        return text in self._placeholder_to_pii
+
     @property
-    def mappings(self) -> dict[str, str]:
-        """Return **all** mappings (both old and newly created)."""
-        return dict(self._placeholder_to_pii)
+    def mappings(self) -> Mapping[str, str]:
+        """Return a read-only view of **all** mappings (both old and newly created)."""
+        return MappingProxyType(self._placeholder_to_pii)
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -60,62 +154,117 @@ class PlaceholderManager:
             return
 
         for placeholder, original in self._placeholder_to_pii.items():
-            match = self._placeholder_re.fullmatch(placeholder)
-            if not match:
+            parsed = _parse_placeholder(placeholder)
+            if parsed is None:
                 logger.warning(
                     "Malformed placeholder '%s' in existing mappings – skipped.",
                     placeholder,
                 )
                 continue
 
-            entity, number_s = match.groups()
-            number = int(number_s)
-            self._entity_counters[entity] = max(self._entity_counters[entity], number)
+            entity, number = parsed
+            entity = _canonical_entity(entity)
+            self._entity_counters[entity] = max(
+                self._entity_counters.get(entity, 0), number
+            )
             self._pii_to_placeholder[(entity, original)] = placeholder
 
 
+def _segments(
+    text: str, replacements: Iterable[tuple[int, int, str]]
+) -> Iterator[str]:
+    """Yield the untouched slices of *text* interleaved with the placeholders
+    replacing sorted, non-overlapping ``(start, end, placeholder)`` spans."""
+    cursor = 0
+    for start, end, placeholder in replacements:
+        yield text[cursor:start]
+        yield placeholder
+        cursor = end
+    yield text[cursor:]
+
+
+def _splice(
+    text: str, replacements: Iterable[tuple[int, int, str]]
+) -> tuple[str, list[tuple[int, int]]]:
+    """Replace sorted, non-overlapping ``(start, end, placeholder)`` spans of *text*.
+
+    The output is assembled once from slices of the untouched *text*, so each
+    character is copied a single time however many replacements there are.
+    Returns the new text together with the spans the placeholders occupy in it.
+    """
+    parts: list[str] = []
+    spans: list[tuple[int, int]] = []
+    cursor = 0
+    out_len = 0
+    for start, end, placeholder in replacements:
+        parts.append(text[cursor:start])
+        out_len += start - cursor
+        parts.append(placeholder)
+        spans.append((out_len, out_len + len(placeholder)))
+        out_len += len(placeholder)
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts), spans
+
+
+def _to_replacements(
+    pm: PlaceholderManager, detections: list[Detection]
+) -> Iterator[tuple[int, int, str]]:
+    """Lazily assign a placeholder to each detection, preserving order."""
+    return (
+        (start, end, pm.placeholder_for(entity, value))
+        for start, end, entity, value in detections
+    )
+
+
 ###############################################################################
 # Masking engines
 ###############################################################################
 
+# (analyzer id, text, language, entities) -> raw analyzer results. The text
+# itself is the key: spans recalled for a colliding hash would mask the wrong
+# characters.
+AnalyzeCacheKey = tuple[int, str, str, frozenset[str]]
+
+# Rough per-result footprint in characters, used to bound the cache size
+_RESULT_SIZE_ESTIMATE = 64
+
+_analyze_cache: LRUCache[AnalyzeCacheKey, tuple[RecognizerResult, ...]] = LRUCache(
+    max_entries=ANALYZE_CACHE_MAX_ENTRIES,
+    max_size=ANALYZE_CACHE_MAX_CHARS,
+    sizeof=lambda key, results: len(key[1]) + _RESULT_SIZE_ESTIMATE * len(results),
+)
+
 
 class AddressMasker:
     """Detect and replace US addresses using *pyap* (more accurate than Presidio)."""
 
+    __slots__ = ("_pm",)
+
     def __init__(self, placeholder_mgr: PlaceholderManager):
         self._pm = placeholder_mgr
 
+    def detect(self, text: str) -> list[Detection]:
+        """Return the US addresses in *text*, ordered by position."""
+        return sorted(
+            (addr.match_start, addr.match_end, "LOCATION", addr.full_address)
+            for addr in pyap.parse(text, country="US")
+        )
+
     def mask(self, text: str) -> tuple[str, list[tuple[int, int]]]:
         """Return (masked_text, spans_of_inserted_placeholders)."""
-        replacements = []
-        for addr in pyap.parse(text, country="US"):
-            placeholder = self._pm.placeholder_for("LOCATION", addr.full_address)
-            replacements.append(
-                {
-                    "start": addr.match_start,
-                    "end": addr.match_end,
-                    "placeholder": placeholder,
-                }
-            )
+        return _splice(text, _to_replacements(self._pm, self.detect(text)))
 
-        # Apply replacements left→right while adjusting offsets
-        replacements.sort(key=lambda r: r["start"])
-        offset = 0
-        masked = text
-        spans: list[tuple[int, int]] = []
-        for rep in replacements:
-            start = rep["start"] + offset
-            end = rep["end"] + offset
-            masked = masked[:start] + rep["placeholder"] + masked[end:]
-            offset += len(rep["placeholder"]) - (rep["end"] - rep["start"])
-            spans.append((start, start + len(rep["placeholder"])))
 
-        return masked, spans
+# Sort key over (start, -length, -score, ...): leftmost, then longest, then best
+_SELECTION_ORDER = itemgetter(0, 1, 2)
 
 
 class PresidioMasker:
     """Detect and replace all *remaining* entities with Microsoft Presidio."""
 
+    __slots__ = ("analyzer", "_pm", "language")
+
     def __init__(
         self,
         analyzer: AnalyzerEngine,
@@ -130,6 +279,73 @@ class PresidioMasker:
     # Public helpers
     # ------------------------------------------------------------------
 
+    def analyze(self, text: str, entities: list[str]) -> list[RecognizerResult]:
+        """Run the analyzer over *text*; safe to call from a worker thread.
+
+        Results are memoised per ``(text, entities, language)``, so re-masking
+        the same text only repeats the cheap selection and splicing steps.
+        """
+        key = self._cache_key(text, entities)
+        cached = _analyze_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        with track_dlp_failures() as dlp_failures:
+            results: list[RecognizerResult] = self.analyzer.analyze(
+                text=text,
+                language=self.language,
+                entities=entities,
+                score_threshold=MIN_THRESHOLD,
+            )
+        return self._remember(key, results, dlp_failures)
+
+    async def analyze_batched(
+        self, text: str, entities: list[str], batcher: AnalysisBatcher
+    ) -> list[RecognizerResult]:
+        """Like :meth:`analyze`, but shares the analyzer call with concurrent requests."""
+        key = self._cache_key(text, entities)
+        cached = _analyze_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        with track_dlp_failures() as dlp_failures:
+            results = await batcher.submit(
+                self.analyzer, text, self.language, entities, MIN_THRESHOLD
+            )
+        return self._remember(key, results, dlp_failures)
+
+    def select(
+        self,
+        text: str,
+        results: list[RecognizerResult],
+        exclude_spans: list[tuple[int, int]],
+    ) -> list[Detection]:
+        """Pick non-overlapping *results* that do **not** overlap *exclude_spans*."""
+        # Sort for greedy longest‑first selection per original impl. The key
+        # fields are read once into tuples so the sort compares them in C.
+        ordered = [
+            (r.start, r.start - r.end, -r.score, r.end, r.entity_type)
+            for r in results
+        ]
+        ordered.sort(key=_SELECTION_ORDER)
+
+        excluded = sorted((ss, ee) for ss, ee in exclude_spans if ss < ee)
+        excluded_starts = [ss for ss, _ in excluded]
+        excluded_max_ends = list(accumulate((ee for _, ee in excluded), max))
+
+        chosen: list[Detection] = []
+        last_end = -1
+        for start, _, _, end, entity_type in ordered:
+            if self._overlaps_any(start, end, excluded_starts, excluded_max_ends):
+                continue
+            value = text[start:end]
+            if self._pm.is_known_placeholder(value):
+                continue  # already a placeholder
+            if start >= last_end:
+                chosen.append((start, end, entity_type, value))
+                last_end = end
+        return chosen
+
     def mask(
         self,
         text: str,
@@ -140,73 +356,115 @@ class PresidioMasker:
         if not entities:
             return text
 
-        results: list[RecognizerResult] = self.analyzer.analyze(
-            text=text,
-            language=self.language,
-            entities=entities,
-            score_threshold=MIN_THRESHOLD,
-        )
-        logger.info(
-            "ALL ANALYZER RESULTS: %s",
-            [(r.entity_type, r.start, r.end, r.score) for r in results]
-        )
-
-        # Sort for greedy longest‑first selection per original impl.
-        results.sort(key=lambda r: (r.start, -(r.end - r.start), -r.score))
-
-        chosen: list[RecognizerResult] = []
-        last_end = -1
-        for res in results:
-            if self._overlaps_any(res.start, res.end, exclude_spans):
-                continue
-            if text[res.start : res.end] in self._pm.mappings.keys():
-                continue  # already a placeholder
-            if res.start >= last_end:
-                chosen.append(res)
-                last_end = res.end
-
-        # Replace in text while tracking offset shifts
-        offset = 0
-        masked = text
-        for res in chosen:
-            entity = res.entity_type
-            s = res.start + offset
-            e = res.end + offset
-            original_val = masked[s:e]
-            placeholder = self._pm.placeholder_for(entity, original_val)
-            masked = masked[:s] + placeholder + masked[e:]
-            offset += len(placeholder) - len(original_val)
-
-        return masked
+        detections = self.select(text, self.analyze(text, entities), exclude_spans)
+        return "".join(_segments(text, _to_replacements(self._pm, detections)))
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
+    def _cache_key(self, text: str, entities: list[str]) -> AnalyzeCacheKey:
+        return (id(self.analyzer), text, self.language, frozenset(entities))
+
+    @staticmethod
+    def _remember(
+        key: AnalyzeCacheKey,
+        results: list[RecognizerResult],
+        dlp_failures: list[BaseException],
+    ) -> list[RecognizerResult]:
+        # Results missing DLP's findings must not be served to later requests
+        if not dlp_failures:
+            _analyze_cache.put(key, tuple(results))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "ALL ANALYZER RESULTS: %s",
+                [(r.entity_type, r.start, r.end, r.score) for r in results]
+            )
+        return results
+
     @staticmethod
-    def _overlaps_any(s: int, e: int, spans: list[tuple[int, int]]) -> bool:
-        return any(max(s, ss) < min(e, ee) for ss, ee in spans)
+    def _overlaps_any(s: int, e: int, starts: list[int], max_ends: list[int]) -> bool:
+        """Return whether ``[s, e)`` overlaps any of the excluded spans.
+
+        *starts* holds the sorted span starts and ``max_ends[i]`` the largest end
+        among the first ``i + 1`` spans, so one bisect answers the query. As with
+        ``max(s, ss) < min(e, ee)``, an empty ``[s, s)`` overlaps nothing.
+        """
+        if s >= e:
+            return False
+        idx = bisect_left(starts, e) - 1  # last span starting before e
+        return idx >= 0 and max_ends[idx] > s
 
 
 ###############################################################################
-# Public façade
+# Result cache
 ###############################################################################
 
+# (analyzer id, sentence, language, entities, JSON of existing mappings)
+MaskCacheKey = tuple[int, str, str, tuple[str, ...], bytes]
+MaskResult = tuple[str, Mapping[str, str]]
 
-def mask_sentence(
+
+def _mask_result_size(key: MaskCacheKey, value: MaskResult) -> int:
+    """Approximate the characters held by a cache entry (existing mappings count twice)."""
+    _, sentence, _, _, existing = key
+    masked, mappings = value
+    return (
+        len(sentence)
+        + len(masked)
+        + len(existing)
+        + sum(len(k) + len(v) for k, v in mappings.items())
+    )
+
+
+_mask_cache: LRUCache[MaskCacheKey, MaskResult] = LRUCache(
+    max_entries=MASK_CACHE_MAX_ENTRIES,
+    max_size=MASK_CACHE_MAX_CHARS,
+    sizeof=_mask_result_size,
+)
+
+
+def _mask_cache_key(
     sentence: str,
     analyzer: AnalyzerEngine | None,
     language: str,
     presidio_entities: list[str] | None,
     existing_mappings: dict[str, str] | None,
-) -> tuple[str, dict[str, str]]:
-    """Mask PII in *sentence* and return (masked_sentence, placeholder→PII map)."""
-    start_t = time.time()
+) -> MaskCacheKey:
+    # The full sentence is part of the key: a hash collision here would hand
+    # one caller another caller's PII.
+    return (
+        id(analyzer),
+        sentence,
+        language,
+        tuple(sorted(presidio_entities or ())),
+        # orjson serialises the mappings in C, far cheaper than a tuple of
+        # tuples for large chat sessions. Insertion order is kept on purpose
+        # (no OPT_SORT_KEYS): it decides which placeholder wins for a repeated
+        # value, and the order of the output, so reordered mappings must miss.
+        orjson.dumps(existing_mappings or {}),
+    )
+
+
+def clear_mask_caches() -> None:
+    """Drop every cached mask and analyzer result, e.g. when the analyzer is (re)initialised."""
+    _mask_cache.clear()
+    _analyze_cache.clear()
+
 
+###############################################################################
+# Public façade
+###############################################################################
+
+
+def _validate_entities(presidio_entities: list[str] | None) -> None:
+    """Raise a 422 if any requested entity is not a known Presidio entity."""
     # Check if presidio entities are provided and values are in PRESIDIO_ENTITIES
     if presidio_entities:
         invalid_entities = [
-            entity for entity in presidio_entities if entity not in PRESIDIO_ENTITIES
+            entity
+            for entity in presidio_entities
+            if entity not in PRESIDIO_ENTITIES_SET
         ]
         if invalid_entities:
             logger.warning(
@@ -223,59 +481,320 @@ def mask_sentence(
                 detail=f"Invalid Presidio entities: {invalid_entities}."
             )
 
+
+def _effective_entities(presidio_entities: list[str] | None) -> Sequence[str]:
+    """Return the entities to mask for this request.
+
+    Requested names are already validated, so they are swapped for their
+    interned copies and later dict probes hit on identity. Without a request
+    list the shared default tuple is returned as is, without copying.
+    """
+    return (
+        [sys.intern(entity) for entity in presidio_entities]
+        if presidio_entities
+        else PRESIDIO_ENTITIES_DEFAULT
+    )
+
+
+def _without_location(entities: Sequence[str]) -> Sequence[str]:
+    """Return *entities* minus ``LOCATION``, once pyap has handled addresses."""
+    if entities is PRESIDIO_ENTITIES_DEFAULT:
+        return _DEFAULT_NON_LOCATION
+    return [entity for entity in entities if entity != "LOCATION"]
+
+
+def _entities_worth_analyzing(text: str, entities: Sequence[str]) -> list[str]:
+    """Drop the *entities* that cannot possibly occur in *text*.
+
+    Each check is a single C-level scan, far cheaper than the NER pass it can
+    save on acknowledgements ("ok", "thanks!") and other PII-free snippets.
+    """
+    if len(text) < MIN_ANALYZABLE_LENGTH or not _ALNUM_RE.search(text):
+        return []
+
+    has_digit = _DIGIT_RE.search(text) is not None
+    has_at = "@" in text
+    has_ip_hint = has_digit or ":" in text  # IPv6 may be hex-only, e.g. "fe::"
+    return [
+        entity
+        for entity in entities
+        if (has_digit or entity not in _DIGIT_ENTITIES)
+        and (has_at or entity != "EMAIL_ADDRESS")
+        and (has_ip_hint or entity != "IP_ADDRESS")
+    ]
+
+
+def _merge_and_replace(
+    sentence: str,
+    pm: PlaceholderManager,
+    addresses: list[Detection],
+    presidio_masker: PresidioMasker | None,
+    presidio_results: list[RecognizerResult],
+) -> str:
+    """Resolve address and Presidio detections on *sentence* and mask them in one pass.
+
+    Addresses always win: Presidio results overlapping an address are dropped.
+    """
+    detections = list(addresses)
+    if presidio_masker and presidio_results:
+        address_spans = [(start, end) for start, end, _, _ in addresses]
+        detections.extend(
+            presidio_masker.select(sentence, presidio_results, address_spans)
+        )
+    detections.sort()
+    return "".join(_segments(sentence, _to_replacements(pm, detections)))
+
+
+@dataclass(slots=True)
+class _MaskRun:
+    """State shared by the steps of masking one sentence."""
+
+    cache_key: MaskCacheKey
+    pm: PlaceholderManager
+    entities: Sequence[str]
+    existing_count: int
+    start_t: float
+
+
+def _start_masking(
+    sentence: str,
+    analyzer: AnalyzerEngine | None,
+    language: str,
+    presidio_entities: list[str] | None,
+    existing_mappings: dict[str, str] | None,
+    copy_mappings: bool,
+    caller: str,
+) -> MaskResult | _MaskRun:
+    """Validate the request and return its cached result, or the state to mask it."""
+    start_t = time.perf_counter()
+    _validate_entities(presidio_entities)
+
     if not sentence:
         return "", {}
 
-    # ------------------------------------------------------------------
-    # 1. Setup helpers
-    # ------------------------------------------------------------------
-    pm = PlaceholderManager(existing_mappings)
+    cache_key = _mask_cache_key(
+        sentence, analyzer, language, presidio_entities, existing_mappings
+    )
+    cached = _mask_cache.get(cache_key)
+    if cached is not None:
+        logger.info("%s served from cache", caller)
+        return cached
+
+    existing_count = len(existing_mappings or {})
+    pm = (
+        PlaceholderManager(existing_mappings)
+        if copy_mappings
+        else PlaceholderManager._from_owned(existing_mappings)
+    )
+    return _MaskRun(
+        cache_key, pm, _effective_entities(presidio_entities), existing_count, start_t
+    )
 
-    effective_entities = (
-        list(presidio_entities)
-        if presidio_entities
-        else list(PRESIDIO_ENTITIES)
+
+def _presidio_masker(
+    analyzer: AnalyzerEngine | None,
+    run: _MaskRun,
+    language: str,
+    effective_entities: Sequence[str],
+    analyzable_entities: list[str],
+) -> PresidioMasker | None:
+    """Return the Presidio masker for this run, or None when Presidio can be skipped."""
+    if analyzer and analyzable_entities:
+        return PresidioMasker(analyzer, run.pm, language)
+    if analyzer and effective_entities:
+        logger.info("No analyzable entities in sentence – skipping Presidio step.")
+    elif not analyzer and effective_entities:
+        logger.warning("AnalyzerEngine is None – skipping Presidio masking step.")
+    return None
+
+
+def _finish_masking(
+    sentence: str,
+    run: _MaskRun,
+    addresses: list[Detection],
+    presidio_masker: PresidioMasker | None,
+    presidio_results: list[RecognizerResult],
+    caller: str,
+    dlp_failures: list[BaseException],
+) -> MaskResult:
+    """Replace every detection in a single pass over *sentence* and cache the result.
+
+    Results are not cached after a DLP failure: they may be missing DLP's
+    findings, and a retry should get a fresh analysis.
+    """
+    masked = _merge_and_replace(
+        sentence, run.pm, addresses, presidio_masker, presidio_results
     )
 
+    mappings = run.pm.mappings
+    logger.info(
+        "%s finished in %.4fs – generated %d new mappings (total %d)",
+        caller,
+        time.perf_counter() - run.start_t,
+        len(mappings) - run.existing_count,
+        len(mappings),
+    )
+    if not dlp_failures:
+        _mask_cache.put(run.cache_key, (masked, mappings))
+    return masked, mappings
+
+
+def mask_sentence(
+    sentence: str,
+    analyzer: AnalyzerEngine | None,
+    language: str,
+    presidio_entities: list[str] | None,
+    existing_mappings: dict[str, str] | None,
+    *,
+    copy_mappings: bool = True,
+) -> tuple[str, Mapping[str, str]]:
+    """Mask PII in *sentence* and return (masked_sentence, placeholder→PII map).
+
+    Pass ``copy_mappings=False`` when *existing_mappings* is owned by the
+    caller and not reused, e.g. freshly decoded from a request body, to skip
+    the defensive copy; the dict is then extended in place.
+    """
+    run = _start_masking(
+        sentence,
+        analyzer,
+        language,
+        presidio_entities,
+        existing_mappings,
+        copy_mappings,
+        "mask_sentence",
+    )
+    if not isinstance(run, _MaskRun):
+        return run
+    effective_entities = run.entities
+
     # ------------------------------------------------------------------
-    # 2. First pass – addresses via pyap
+    # 1. First pass – addresses via pyap
     # ------------------------------------------------------------------
-    address_spans: list[tuple[int, int]] = []
-    current_text = sentence
+    addresses: list[Detection] = []
     if "LOCATION" in effective_entities:
-        address_start = time.time()
-        current_text, address_spans = AddressMasker(pm).mask(sentence)
-        logger.info("pyap address detection took %.4fs", time.time() - address_start)
-        if address_spans:
-            logger.info("pyap found and masked %d addresses.", len(address_spans))
-            effective_entities.remove("LOCATION")
+        address_start = time.perf_counter()
+        addresses = AddressMasker(run.pm).detect(sentence)
+        logger.info("pyap address detection took %.4fs", time.perf_counter() - address_start)
+        if addresses:
+            logger.info("pyap found %d addresses.", len(addresses))
+            effective_entities = _without_location(effective_entities)
         else:
             logger.info(
                 "pyap found no addresses. Presidio will handle LOCATION entity."
             )
 
     # ------------------------------------------------------------------
-    # 3. Second pass – remaining entities via Presidio
+    # 2. Second pass – remaining entities via Presidio
     # ------------------------------------------------------------------
-    if analyzer and effective_entities:
-        presidio_start = time.time()
-        current_text = PresidioMasker(analyzer, pm, language).mask(
-            text=current_text,
-            entities=effective_entities,
-            exclude_spans=address_spans,
-        )
-        logger.info(
-            "Presidio masking (entities=%s) took %.4fs",
-            effective_entities,
-            time.time() - presidio_start,
-        )
-    elif not analyzer and effective_entities:
-        logger.warning("AnalyzerEngine is None – skipping Presidio masking step.")
+    presidio_results: list[RecognizerResult] = []
+    analyzable_entities = _entities_worth_analyzing(sentence, effective_entities)
+    presidio_masker = _presidio_masker(
+        analyzer, run, language, effective_entities, analyzable_entities
+    )
+    with track_dlp_failures() as dlp_failures:
+        if presidio_masker:
+            presidio_start = time.perf_counter()
+            presidio_results = presidio_masker.analyze(sentence, analyzable_entities)
+            logger.info(
+                "Presidio analysis (entities=%s) took %.4fs",
+                analyzable_entities,
+                time.perf_counter() - presidio_start,
+            )
+
+    # ------------------------------------------------------------------
+    # 3. Replace everything in a single pass over the original sentence
+    # ------------------------------------------------------------------
+    return _finish_masking(
+        sentence,
+        run,
+        addresses,
+        presidio_masker,
+        presidio_results,
+        "mask_sentence",
+        dlp_failures,
+    )
+
 
+async def _no_detections() -> list:
+    return []
+
+
+async def _analyze_async(
+    presidio_masker: PresidioMasker,
+    sentence: str,
+    entities: list[str],
+    batcher: AnalysisBatcher | None,
+) -> list[RecognizerResult]:
+    if batcher is not None and batcher.running:
+        return await presidio_masker.analyze_batched(sentence, entities, batcher)
+    return await asyncio.to_thread(presidio_masker.analyze, sentence, entities)
+
+
+async def mask_sentence_async(
+    sentence: str,
+    analyzer: AnalyzerEngine | None,
+    language: str,
+    presidio_entities: list[str] | None,
+    existing_mappings: dict[str, str] | None,
+    *,
+    copy_mappings: bool = True,
+    batcher: AnalysisBatcher | None = None,
+) -> tuple[str, Mapping[str, str]]:
+    """Async variant of :func:`mask_sentence` for the request path.
+
+    pyap and Presidio both run on the original *sentence* in worker threads at
+    the same time, so the event loop is never blocked and the request only
+    waits for the slower of the two. Since Presidio cannot know up front
+    whether pyap will find an address, it is always asked for ``LOCATION``
+    and its ``LOCATION`` results are discarded when pyap finds one.
+
+    With a running *batcher*, the Presidio call is coalesced with those of
+    concurrent requests instead of running on its own.
+    """
+    run = _start_masking(
+        sentence,
+        analyzer,
+        language,
+        presidio_entities,
+        existing_mappings,
+        copy_mappings,
+        "mask_sentence_async",
+    )
+    if not isinstance(run, _MaskRun):
+        return run
+
+    analyzable_entities = _entities_worth_analyzing(sentence, run.entities)
+    presidio_masker = _presidio_masker(
+        analyzer, run, language, run.entities, analyzable_entities
+    )
+
+    with track_dlp_failures() as dlp_failures:
+        addresses, presidio_results = await asyncio.gather(
+            asyncio.to_thread(AddressMasker(run.pm).detect, sentence)
+            if "LOCATION" in run.entities
+            else _no_detections(),
+            _analyze_async(presidio_masker, sentence, analyzable_entities, batcher)
+            if presidio_masker
+            else _no_detections(),
+        )
     logger.info(
-        "mask_sentence finished in %.4fs – generated %d new mappings (total %d)",
-        time.time() - start_t,
-        len(pm.mappings) - len(existing_mappings or {}),
-        len(pm.mappings),
+        "pyap and Presidio detection (entities=%s) took %.4fs",
+        analyzable_entities,
+        time.perf_counter() - run.start_t,
+    )
+
+    if addresses:
+        logger.info("pyap found %d addresses.", len(addresses))
+        presidio_results = [
+            res for res in presidio_results if res.entity_type != "LOCATION"
+        ]
+
+    return _finish_masking(
+        sentence,
+        run,
+        addresses,
+        presidio_masker,
+        presidio_results,
+        "mask_sentence_async",
+        dlp_failures,
     )
-    return current_text, pm.mappings
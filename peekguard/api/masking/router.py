@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from presidio_analyzer import AnalyzerEngine
+from pydantic import ValidationError
 
 from peekguard.utils.alerts import send_alert
 from peekguard.utils.logger import get_logger
 from peekguard.utils.metrics import incr, timing_to_statsd_async
 
-from .handler import mask_sentence
+from .handler import mask_sentence_async
 from .schema import MaskRequest, MaskResponse
 
 masking_router = APIRouter()
@@ -44,28 +46,68 @@ async def get_analyzer_engine_dependency(request: Request) -> AnalyzerEngine:
     return analyzer
 
 
+async def parse_mask_request(request: Request) -> MaskRequest:
+    """Validate the raw body straight from JSON in pydantic-core.
+
+    This skips FastAPI's ``json.loads`` + dict validation round trip, which is
+    noticeable for large `existing_mappings`. Errors keep FastAPI's 422 shape.
+    """
+    try:
+        return MaskRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+        )
+
+
 @timing_to_statsd_async("peekguard.api.masking")
-@masking_router.post("/mask", response_model=MaskResponse, summary="Mask PII in Text")
+@masking_router.post(
+    "/mask",
+    response_model=MaskResponse,
+    summary="Mask PII in Text",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": MaskRequest.model_json_schema()}
+            },
+            "required": True,
+        }
+    },
+)
 async def mask_pii_data(
-    request_data: MaskRequest,
+    request: Request,
+    # Declared first so a malformed body is rejected with 422 before readiness is checked
+    request_data: MaskRequest = Depends(parse_mask_request),
     analyzer: AnalyzerEngine = Depends(get_analyzer_engine_dependency),
 ):
     """
     Masks PII in input text using pyap for addresses and Presidio for other entities.
     Supports continuous masking via `existing_mappings`.
     """
-    logger.info(f"Received mask request: {request_data}.")
+    logger.info("Received mask request: %s.", request_data)
     try:
-        masked_text, mappings = mask_sentence(
+        masked_text, mappings = await mask_sentence_async(
             sentence=request_data.text_data,
             analyzer=analyzer,
             language=request_data.language,
             presidio_entities=request_data.entities,
             existing_mappings=request_data.existing_mappings,
+            copy_mappings=False,
+            batcher=getattr(request.app.state, "analysis_batcher", None),
         )
-        logger.info(f"mask request processed. Returning {len(mappings)} mappings.")
+        logger.info("mask request processed. Returning %d mappings.", len(mappings))
         incr("peekguard.api.masking.success")
-        return MaskResponse(masked_data=masked_text, mappings=mappings)
+        # Our own output is well-formed, so skip validating it again; the
+        # mappings come back as a read-only view and need a plain dict
+        return Response(
+            MaskResponse.model_construct(
+                masked_data=masked_text, mappings=dict(mappings)
+            ).model_dump_json(),
+            media_type="application/json",
+        )
     except Exception as e:
         logger.error(
             "Error during mask PII operation, re-raising for generic handler.",
@@ -1,4 +1,11 @@
-from fastapi import APIRouter, HTTPException
+import re
+from functools import lru_cache
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from pydantic import Field, TypeAdapter, ValidationError
 
 from peekguard.utils.alerts import send_alert
 from peekguard.utils.logger import get_logger
@@ -9,35 +16,126 @@ from .schema import (
     UnmaskResponse,
 )
 
-unmasking_router = APIRouter()
+unmasking_router = APIRouter(default_response_class=ORJSONResponse)
 logger = get_logger(__name__)
 
+# A placeholder-shaped token. A key of this shape starting at some position
+# can only end at the first ">" after it, so one scan finds every such key
+# without knowing the mappings in advance.
+_PLACEHOLDER_TOKEN = re.compile(r"<[^<>]+>")
+
+
+@lru_cache(maxsize=1024)
+def _placeholder_pattern(placeholders: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile a single alternation matching any of *placeholders*.
+
+    Longer placeholders come first so that, when one key is a prefix of
+    another, the longest one wins.
+    """
+    return re.compile(
+        "|".join(re.escape(ph) for ph in sorted(placeholders, key=len, reverse=True))
+    )
+
 
 def _unmask_sentence(masked_data: str, mappings: dict[str, str]) -> str:
-    """Replace placeholders in *masked_data* with their original PII values."""
+    """Replace placeholders in *masked_data* with their original PII values.
+
+    All placeholders are substituted in one left-to-right pass, so restored
+    values are never scanned again for further placeholders.
+    """
     if not masked_data or not mappings:
         return masked_data
+    if len(mappings) == 1:
+        # A single literal: str.replace is one non-overlapping pass as well
+        ((placeholder, value),) = mappings.items()
+        return masked_data.replace(placeholder, value)
+
+    # Mappings produced by /mask hold placeholder-shaped keys only: scan with
+    # the precompiled token pattern and keep tokens that are not mapped
+    if all(_PLACEHOLDER_TOKEN.fullmatch(ph) for ph in mappings):
+        return _PLACEHOLDER_TOKEN.sub(
+            lambda m: mappings.get(m.group(0), m.group(0)), masked_data
+        )
+
+    pattern = _placeholder_pattern(tuple(sorted(mappings)))
+    return pattern.sub(lambda m: mappings[m.group(0)], masked_data)
+
+
+# Upper bound on the items of one /unmask/batch call, so a single request
+# cannot hold the worker for an unbounded amount of work
+UNMASK_BATCH_MAX_ITEMS = 256
+
+_UNMASK_BATCH_ADAPTER = TypeAdapter(
+    Annotated[list[UnmaskRequest], Field(max_length=UNMASK_BATCH_MAX_ITEMS)]
+)
+
+
+def _wants_plain_text(request: Request) -> bool:
+    """Return whether the caller asked for text/plain rather than JSON."""
+    accept = request.headers.get("accept", "")
+    return "text/plain" in accept and "application/json" not in accept
+
+
+def _body_validation_error(e: ValidationError) -> RequestValidationError:
+    """Re-raise a body validation failure in FastAPI's 422 shape."""
+    return RequestValidationError(
+        [
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ]
+    )
+
+
+async def parse_unmask_request(request: Request) -> UnmaskRequest:
+    """Validate the raw body straight from JSON in pydantic-core, as /mask does."""
+    try:
+        return UnmaskRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise _body_validation_error(e)
 
-    result = masked_data
-    for ph in sorted(mappings, key=len, reverse=True):
-        result = result.replace(ph, mappings[ph])
-    return result
+
+async def parse_unmask_batch_request(request: Request) -> list[UnmaskRequest]:
+    """Validate a JSON array of unmask requests straight from the raw body."""
+    try:
+        return _UNMASK_BATCH_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise _body_validation_error(e)
 
 
 @timing_to_statsd_async("peekguard.api.unmasking")
 @unmasking_router.post(
-    "/unmask", response_model=UnmaskResponse, summary="Unmask PII in Text"
+    "/unmask",
+    response_model=UnmaskResponse,
+    summary="Unmask PII in Text",
+    responses={200: {"content": {"text/plain": {"schema": {"type": "string"}}}}},
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": UnmaskRequest.model_json_schema()}
+            },
+            "required": True,
+        }
+    },
 )
-async def unmask_pii_data(request_data: UnmaskRequest):
-    """Unmasks previously masked text using the provided placeholder-to-PII mapping."""
-    logger.info(f"Received unmask request: {request_data}.")
+async def unmask_pii_data(
+    request: Request,
+    request_data: UnmaskRequest = Depends(parse_unmask_request),
+):
+    """Unmasks previously masked text using the provided placeholder-to-PII mapping.
+
+    Send ``Accept: text/plain`` to get the unmasked text as the bare body.
+    """
+    logger.info("Received unmask request: %s.", request_data)
     try:
         unmasked_data = _unmask_sentence(
             masked_data=request_data.masked_data, mappings=request_data.mappings
         )
         logger.info("unmask request processed successfully.")
         incr("peekguard.api.unmasking.success")
-        return UnmaskResponse(unmasked_data=unmasked_data)
+        if _wants_plain_text(request):
+            return PlainTextResponse(unmasked_data)
+        # Returned as-is; response_model only documents the schema
+        return ORJSONResponse({"unmasked_data": unmasked_data})
     except Exception as e:
         logger.error(
             "Error during unmask PII operation, re-raising for generic handler.",
@@ -53,3 +151,53 @@ async def unmask_pii_data(request_data: UnmaskRequest):
             status_code=500,
             detail="An error occurred while unmasking the PII data.",
         )
+
+
+@unmasking_router.post(
+    "/unmask/batch",
+    response_model=list[UnmaskResponse],
+    summary="Unmask PII in a Batch of Texts",
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": UnmaskRequest.model_json_schema(),
+                        "maxItems": UNMASK_BATCH_MAX_ITEMS,
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
+)
+@timing_to_statsd_async("peekguard.api.unmasking.batch")
+async def unmask_pii_data_batch(
+    request_data: list[UnmaskRequest] = Depends(parse_unmask_batch_request),
+):
+    """Unmasks several texts in one call; results keep the order of the input."""
+    logger.info("Received unmask batch request with %d items.", len(request_data))
+    try:
+        unmasked = [
+            {"unmasked_data": _unmask_sentence(item.masked_data, item.mappings)}
+            for item in request_data
+        ]
+        logger.info("unmask batch request processed successfully.")
+        incr("peekguard.api.unmasking.batch.success")
+        return ORJSONResponse(unmasked)
+    except Exception as e:
+        logger.error(
+            "Error during unmask PII batch operation, re-raising for generic handler.",
+            exc_info=True,
+        )
+        incr("peekguard.api.unmasking.batch.failure")
+        send_alert(
+            status="critical",
+            name="peekguard_unmask_batch_api_failed",
+            message=f"An error occurred while unmasking the PII data: {str(e)}",
+        )
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while unmasking the PII data.",
+        )
@@ -3,9 +3,12 @@ from contextlib import asynccontextmanager
 import os
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from presidio_analyzer import AnalyzerEngine
 
 from peekguard.api.health.router import health_router
+from peekguard.api.masking.batcher import AnalysisBatcher
+from peekguard.api.masking.handler import clear_mask_caches
 from peekguard.api.masking.router import masking_router
 from peekguard.api.unmasking.router import unmasking_router
 from peekguard.utils.alerts import send_alert
@@ -73,16 +76,24 @@ async def lifespan(
 
     app_instance.state.analyzer_engine = analyzer_instance
     app_instance.state.service_initialized_successfully = initialization_successful
+    clear_mask_caches()
+
+    analysis_batcher = AnalysisBatcher()
+    analysis_batcher.start()
+    app_instance.state.analysis_batcher = analysis_batcher
 
     yield
 
     logger.info("FastAPI application shutdown: Cleaning up resources...")
+    await analysis_batcher.stop()
+    app_instance.state.analysis_batcher = None
     app_instance.state.analyzer_engine = None
     app_instance.state.service_initialized_successfully = False
+    clear_mask_caches()
     logger.info("AnalyzerEngine resources cleaned up.")
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Load Routers
 app.include_router(health_router)
@@ -108,14 +119,24 @@ if __name__ == "__main__":
         case _:
             pass
 
-    port = int(os.environ.get("PORT", default_port))        
+    port = int(os.environ.get("PORT", default_port))
+    # Every worker loads its own spaCy model, so the default stays small
+    # rather than following os.cpu_count() (which reports host CPUs on Cloud Run)
+    workers = int(os.environ.get("PEEKGUARD_WORKERS", 3))
 
-    logger.info("Starting peekguard api on port %d with reload=%s", port, should_reload)
+    logger.info(
+        "Starting peekguard api on port %d with reload=%s and %d workers",
+        port,
+        should_reload,
+        workers,
+    )
     uvicorn.run(
         app="peekguard.main:app",
         host="0.0.0.0",
         port=port,
         reload=should_reload,
-        workers=3,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level="error"
     )
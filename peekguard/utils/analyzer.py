@@ -1,16 +1,38 @@
+import fcntl
 import os
-
-import posix_ipc
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry, RecognizerResult
+from collections.abc import Iterator
+from contextlib import contextmanager
+from importlib import metadata
+
+from presidio_analyzer import (
+    AnalyzerEngine,
+    EntityRecognizer,
+    PatternRecognizer,
+    RecognizerRegistry,
+    RecognizerResult,
+)
 from presidio_analyzer.nlp_engine import NlpEngine, NlpEngineProvider
 
 from peekguard.utils.dlp_recognizer import GoogleDlpRecognizer
+from peekguard.utils.entities import PRESIDIO_ENTITIES_SET
 from peekguard.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Define a unique name for our system-wide semaphore
-SEMAPHORE_NAME = "/peekguard-model-lock"
+SPACY_MODEL_NAME = "en_core_web_md"
+
+# Lock file serializing the first model load across workers, and the sentinel
+# written once a load succeeded (the model files are then in the page cache)
+MODEL_LOCK_PATH = "/tmp/peekguard-model.lock"
+MODEL_READY_PATH = "/tmp/peekguard-model.ready"
+
+# NLP engine loaded by `preload_nlp_engine` before workers are forked
+_preloaded_nlp_engine: NlpEngine | None = None
+
+# spaCy components whose output is never read: entities come from the regex
+# recognizers and Google DLP (SpacyRecognizer is removed), and Presidio's
+# context enhancement only needs tokens and lemmas.
+UNUSED_SPACY_PIPES = ("parser", "ner")
 
 
 class CustomAnalyzer(AnalyzerEngine):
@@ -18,16 +40,10 @@ class CustomAnalyzer(AnalyzerEngine):
     A custom AnalyzerEngine that filters out known false positives.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initializes the CustomAnalyzer with a predefined set of false positives.
-        """
-        super().__init__(*args, **kwargs)
-
-        # Define a mapping of entity types to known false positivess
-        self._false_positives_map = {
-            "PERSON": {"email"},
-        }
+    # Mapping of entity types to known false positives (lowercase)
+    _false_positives_map: dict[str, frozenset[str]] = {
+        "PERSON": frozenset({"email"}),
+    }
 
     def analyze(self, *args, **kwargs) -> list[RecognizerResult]:
         """
@@ -40,21 +56,23 @@ class CustomAnalyzer(AnalyzerEngine):
             text_to_analyze = args[0]
 
         original_results = super().analyze(*args, **kwargs)
+        return self._filter_false_positives(text_to_analyze, original_results)
 
+    def _filter_false_positives(
+        self, text: str, results: list[RecognizerResult]
+    ) -> list[RecognizerResult]:
+        fp_map = self._false_positives_map
         filtered_results = []
-        for res in original_results:
-            # Extract the recognized text using the start/end indices
-            recognized_text = text_to_analyze[res.start : res.end]  # type: ignore
-
-            if res.entity_type in self._false_positives_map:
-                # Check if the recognized text (lowercase) is in the set for that entity type
-                if (
-                    recognized_text.lower()
-                    in self._false_positives_map[res.entity_type]
-                ):
-                    # Skip the result if it's a known false positive
+        for res in results:
+            fp_set = fp_map.get(res.entity_type)
+            # Only results of a listed type need their text sliced out
+            if fp_set is not None:
+                recognized_text = text[res.start : res.end]
+                if recognized_text.lower() in fp_set:
                     logger.debug(
-                        f"Filtering out known false positive: type={res.entity_type}, text='{recognized_text}'"
+                        "Filtering out known false positive: type=%s, text='%s'",
+                        res.entity_type,
+                        recognized_text,
                     )
                     continue
 
@@ -63,10 +81,67 @@ class CustomAnalyzer(AnalyzerEngine):
         return filtered_results
 
 
+class CachedRecognizerRegistry(RecognizerRegistry):
+    """
+    A RecognizerRegistry that memoizes `get_recognizers` per requested entity set.
+
+    AnalyzerEngine filters the whole registry on every `analyze` call, while
+    requests only ever use a handful of entity combinations. Any change to
+    the registered recognizers drops the memo.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._recognizers_by_request: dict[
+            tuple[str, frozenset[str] | None, bool], list[EntityRecognizer]
+        ] = {}
+        super().__init__(*args, **kwargs)
+
+    @property
+    def recognizers(self) -> list[EntityRecognizer]:
+        return self._recognizers
+
+    @recognizers.setter
+    def recognizers(self, recognizers: list[EntityRecognizer]) -> None:
+        self._recognizers = recognizers
+        self._recognizers_by_request.clear()
+
+    def get_recognizers(
+        self,
+        language: str,
+        entities: list[str] | None = None,
+        all_fields: bool = False,
+        ad_hoc_recognizers: list[EntityRecognizer] | None = None,
+    ) -> list[EntityRecognizer]:
+        if ad_hoc_recognizers:
+            return super().get_recognizers(
+                language, entities, all_fields, ad_hoc_recognizers
+            )
+
+        key = (language, frozenset(entities) if entities is not None else None, all_fields)
+        recognizers = self._recognizers_by_request.get(key)
+        if recognizers is None:
+            recognizers = super().get_recognizers(language, entities, all_fields)
+            self._recognizers_by_request[key] = recognizers
+        # Callers may extend the returned list, so hand out a copy
+        return list(recognizers)
+
+    def add_nlp_recognizer(self, *args, **kwargs) -> None:
+        super().add_nlp_recognizer(*args, **kwargs)
+        self._recognizers_by_request.clear()
+
+    def load_predefined_recognizers(self, *args, **kwargs) -> None:
+        super().load_predefined_recognizers(*args, **kwargs)
+        self._recognizers_by_request.clear()
+
+    def add_recognizer(self, recognizer: EntityRecognizer) -> None:
+        super().add_recognizer(recognizer)
+        self._recognizers_by_request.clear()
+
+
 def _initialize_recognizer_registry() -> RecognizerRegistry:
 
     """Initializes RecognizerRegistry and loads predefined recognizers."""
-    registry = RecognizerRegistry()
+    registry = CachedRecognizerRegistry()
     registry.load_predefined_recognizers()
 
     # Remove SpacyRecognizer to avoid false positives in NER (PERSON, LOCATION, ORG).
@@ -75,10 +150,41 @@ def _initialize_recognizer_registry() -> RecognizerRegistry:
     registry.remove_recognizer("SpacyRecognizer")
     logger.info("Removed SpacyRecognizer to prevent NER false positives.")
 
+    _remove_unsupported_recognizers(registry)
+    _compile_recognizer_patterns(registry)
+
     logger.info("Loaded predefined recognizers.")
     return registry
 
 
+def _remove_unsupported_recognizers(registry: RecognizerRegistry) -> None:
+    """Drops predefined recognizers for entities the API never requests."""
+    supported = [
+        recognizer
+        for recognizer in registry.recognizers
+        if PRESIDIO_ENTITIES_SET.intersection(recognizer.supported_entities)
+    ]
+    logger.info(
+        "Removed %d recognizers for unsupported entities.",
+        len(registry.recognizers) - len(supported),
+    )
+    registry.recognizers = supported
+
+
+def _compile_recognizer_patterns(registry: RecognizerRegistry) -> None:
+    """
+    Compiles every recognizer regex up front.
+
+    PatternRecognizer compiles its patterns lazily on the first analyze call,
+    so the first requests of every worker paid for the compilation. Analyzing
+    an empty text compiles them with the same flags, through Presidio's own
+    code path.
+    """
+    for recognizer in registry.recognizers:
+        if isinstance(recognizer, PatternRecognizer):
+            recognizer.analyze(text="", entities=recognizer.supported_entities)
+
+
 def _add_google_dlp_recognizer(
     registry: RecognizerRegistry,
 ) -> None:
@@ -93,6 +199,42 @@ def _add_google_dlp_recognizer(
         logger.warning(f"Skipping Google Cloud DLP recognizer initialization: {e}")
 
 
+def _disable_unused_spacy_pipes(nlp_engine: NlpEngine) -> None:
+    """Disables spaCy pipeline components that nothing downstream consumes."""
+    for lang_code, nlp in getattr(nlp_engine, "nlp", {}).items():
+        disabled = [pipe for pipe in UNUSED_SPACY_PIPES if pipe in nlp.pipe_names]
+        for pipe in disabled:
+            nlp.disable_pipe(pipe)
+        logger.info("Disabled unused spaCy pipes %s for '%s'.", disabled, lang_code)
+
+
+def _create_nlp_engine() -> NlpEngine:
+    """Loads the spaCy model behind Presidio's NLP engine."""
+    nlp_configuration = {
+        "nlp_engine_name": "spacy",
+        "models": [{"lang_code": "en", "model_name": SPACY_MODEL_NAME}],
+    }
+    nlp_engine = NlpEngineProvider(nlp_configuration=nlp_configuration).create_engine()
+    _disable_unused_spacy_pipes(nlp_engine)
+    logger.info("NLP engine created successfully.")
+    return nlp_engine
+
+
+def preload_nlp_engine() -> None:
+    """
+    Loads the NLP engine in the current process ahead of forking workers.
+
+    Workers forked afterwards (gunicorn `preload_app`) reuse the loaded model
+    copy-on-write instead of each loading their own copy. Only the NLP engine
+    is preloaded: the registry holds the DLP gRPC client, which must be
+    created after the fork.
+    """
+    global _preloaded_nlp_engine
+    if _preloaded_nlp_engine is None:
+        _preloaded_nlp_engine = _create_nlp_engine()
+        logger.info("Preloaded NLP engine in PID %d.", os.getpid())
+
+
 def _initialize_nlp_engine_and_registry() -> tuple[
     NlpEngine | None, RecognizerRegistry | None
 ]:
@@ -101,86 +243,140 @@ def _initialize_nlp_engine_and_registry() -> tuple[
         registry = _initialize_recognizer_registry()
         _add_google_dlp_recognizer(registry)
 
-        nlp_configuration = {
-            "nlp_engine_name": "spacy",
-            "models": [{"lang_code": "en", "model_name": "en_core_web_md"}],
-        }
-        nlp_engine = NlpEngineProvider(
-            nlp_configuration=nlp_configuration
-        ).create_engine()
-        logger.info("NLP engine created successfully.")
-
+        nlp_engine = _preloaded_nlp_engine or _create_nlp_engine()
         return nlp_engine, registry
     except ImportError:
         logger.error(
             "Model not found. "
-            "Please run: pip install spacy && python -m spacy download en_core_web_md"
+            f"Please run: pip install spacy && python -m spacy download {SPACY_MODEL_NAME}"
         )
     except Exception as e:
         logger.error(f"Failed to create NLP engine or registry: {e}", exc_info=True)
     return None, None
 
 
-def initialize_analyzer_engine() -> tuple[AnalyzerEngine | None, bool]:
+def _build_analyzer_engine() -> tuple[AnalyzerEngine | None, bool]:
+    """Creates the NLP engine, registry and CustomAnalyzer."""
+    try:
+        nlp_engine_instance, registry_instance = _initialize_nlp_engine_and_registry()
+
+        if not nlp_engine_instance or not registry_instance:
+            logger.error("NLP Engine or Registry initialization failed.")
+            return None, False
+
+        supported_langs = nlp_engine_instance.get_supported_languages()
+        analyzer_instance = CustomAnalyzer(
+            nlp_engine=nlp_engine_instance,
+            registry=registry_instance,
+            supported_languages=supported_langs,
+        )
+        return analyzer_instance, True
+    except Exception as e:
+        logger.critical(
+            f"Critical error during AnalyzerEngine init: {e}", exc_info=True
+        )
+        return None, False
+
+
+@contextmanager
+def _model_load_lock() -> Iterator[None]:
     """
-    Initializes the Presidio AnalyzerEngine sequentially across workers
-    using a named semaphore to prevent simultaneous model loading.
+    Holds an exclusive flock on MODEL_LOCK_PATH.
+
+    The lock is tried without blocking first, so an uncontended worker never
+    sleeps in the kernel; it is released when the file is closed.
     """
     pid = os.getpid()
-    sem = None  # Initialize semaphore variable
+    with open(MODEL_LOCK_PATH, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info("Worker [PID: %d] is waiting for the model load lock...", pid)
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        logger.info("Worker [PID: %d] acquired the model load lock.", pid)
+        yield
+    logger.info("Worker [PID: %d] released the model load lock.", pid)
+
 
-    # O_CREAT flag creates the semaphore if it doesn't exist.
-    # We initialize it with a value of 1, making it function like a mutex.
+def _model_ready_token() -> str:
+    """
+    Identifies the worker group and model a ready sentinel was written for.
+
+    Workers share their parent's PID, so a sentinel left by an earlier run or
+    for another model version never matches.
+    """
     try:
-        sem = posix_ipc.Semaphore(SEMAPHORE_NAME, posix_ipc.O_CREAT, initial_value=1)
+        model_version = metadata.version(SPACY_MODEL_NAME)
+    except metadata.PackageNotFoundError:
+        model_version = "unknown"
+    return f"{os.getppid()} {SPACY_MODEL_NAME} {model_version}"
 
-        logger.info(f"Worker [PID: {pid}] is waiting to acquire semaphore...")
 
-        # This is a blocking call. The worker will pause here until the
-        # semaphore is available.
-        sem.acquire()
+def _model_is_warm() -> bool:
+    try:
+        with open(MODEL_READY_PATH) as sentinel:
+            return sentinel.read() == _model_ready_token()
+    except OSError:
+        return False
 
-        logger.info(f"Worker [PID: {pid}] acquired semaphore. Loading model...")
 
-        # --- CRITICAL SECTION: Original logic starts here ---
-        analyzer_instance: AnalyzerEngine | None = None
-        initialization_successful = False
-        try:
-            nlp_engine_instance, registry_instance = (
-                _initialize_nlp_engine_and_registry()
-            )
+def _mark_model_ready() -> None:
+    tmp_path = f"{MODEL_READY_PATH}.{os.getpid()}"
+    try:
+        with open(tmp_path, "w") as sentinel:
+            sentinel.write(_model_ready_token())
+        # Readers never see a partly written token
+        os.replace(tmp_path, MODEL_READY_PATH)
+    except OSError as e:
+        logger.warning("Could not write model ready sentinel: %s", e)
 
-            if not nlp_engine_instance or not registry_instance:
-                logger.error("NLP Engine or Registry initialization failed.")
-                return None, False
 
-            supported_langs = nlp_engine_instance.get_supported_languages()
-            analyzer_instance = CustomAnalyzer(
-                nlp_engine=nlp_engine_instance,
-                registry=registry_instance,
-                supported_languages=supported_langs,
-            )
-            initialization_successful = True
-        except Exception as e:
-            logger.critical(
-                f"Critical error during AnalyzerEngine init: {e}", exc_info=True
-            )
-        # --- CRITICAL SECTION ENDS ---
+def clear_model_ready() -> None:
+    """Removes the ready sentinel, e.g. at startup or after a failed load."""
+    try:
+        os.remove(MODEL_READY_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not remove model ready sentinel: %s", e)
+
+
+def initialize_analyzer_engine() -> tuple[AnalyzerEngine | None, bool]:
+    """
+    Initializes the Presidio AnalyzerEngine, loading the model one worker at a
+    time until a first load succeeds.
 
-        logger.info(f"Worker [PID: {pid}] has finished loading the model.")
+    Once the ready sentinel exists the model files are already in the page
+    cache, so later workers load concurrently without taking the lock. When
+    the parent preloaded the NLP engine, no model is loaded at all.
+    """
+    pid = os.getpid()
+    if _preloaded_nlp_engine is not None:
+        logger.info("Worker [PID: %d] reuses the preloaded NLP engine.", pid)
+        return _build_analyzer_engine()
+
+    if _model_is_warm():
+        logger.info("Worker [PID: %d] found a warm model, loading without lock.", pid)
+        analyzer_instance, initialization_successful = _build_analyzer_engine()
+        if not initialization_successful:
+            clear_model_ready()
         return analyzer_instance, initialization_successful
 
-    except Exception as e:
+    try:
+        with _model_load_lock():
+            logger.info("Worker [PID: %d] is loading the model...", pid)
+            analyzer_instance, initialization_successful = _build_analyzer_engine()
+            if initialization_successful:
+                _mark_model_ready()
+            else:
+                clear_model_ready()
+    except OSError as e:
         logger.error(
-            f"An error occurred during semaphore-based model loading: {e}",
+            f"An error occurred during lock-based model loading: {e}",
             exc_info=True,
         )
         return None, False
 
-    finally:
-        # This block ensures the semaphore is always released by the worker
-        # that acquired it, even if an error occurred during loading.
-        if sem:
-            sem.release()
-            logger.info(f"Worker [PID: {pid}] released semaphore.")
-            sem.close()
\ No newline at end of file
+    logger.info("Worker [PID: %d] has finished loading the model.", pid)
+    return analyzer_instance, initialization_successful
@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class LRUCache[K: Hashable, V]:
+    """Thread-safe LRU cache bounded by entry count and, optionally, total size.
+
+    :param max_entries: Maximum number of entries kept in the cache
+    :param max_size: Maximum sum of ``sizeof(key, value)`` over all entries (Default: unbounded)
+    :param sizeof: Callable estimating the size of an entry, required with `max_size`
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_size: int | None = None,
+        sizeof: Callable[[K, V], int] | None = None,
+    ) -> None:
+        assert max_entries > 0, f"Invalid max_entries '{max_entries}'"
+        assert max_size is None or sizeof, "max_size requires a sizeof callable"
+
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._sizeof = sizeof
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for `key` (marking it recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """Store `value` under `key`, evicting least recently used entries as needed"""
+        size = self._sizeof(key, value) if self._sizeof else 0
+        if self._max_size is not None and size > self._max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+            while len(self._entries) > self._max_entries or (
+                self._max_size is not None and self._size > self._max_size
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
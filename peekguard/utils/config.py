@@ -1,7 +1,7 @@
 import os
 import tomllib
-import hvac
 from enum import StrEnum
+from functools import lru_cache
 from importlib import resources
 from typing import Any, Callable, LiteralString
 
@@ -53,6 +53,7 @@ def _load_config():
     _config = tomllib.loads(
         resources.read_text(package=config_package, resource=config_file)
     )
+    _lookup_config.cache_clear()
     assert _config, (
         f"Invalid config for '{environment}' from '{config_package}:{config_file}':\n{_config}"
     )
@@ -75,18 +76,27 @@ def get_config[T](key: LiteralString, coerce: Callable[[Any], T] = str) -> T:
     if not _config:
         _load_config()
 
-    result = _config
     try:
-        for k in key.split("."):
-            result = result[k]
+        result = _lookup_config(key)
     except KeyError as ke:
         _logger.exception("Unknown config '%s'", key)
         raise ke
     return coerce(result)
 
 
+@lru_cache(maxsize=None)
+def _lookup_config(key: str) -> Any:
+    """Walk `_config` for a dot-separated key; cleared whenever `_load_config` runs"""
+    result = _config
+    for k in key.split("."):
+        result = result[k]
+    return result
+
+
 def init_vault_client():
     """Init vault client object and return it"""
+    import hvac  # only needed where Vault is used (production)
+
     global vault_client
     vault_client = hvac.Client(
         url=get_config("vault", "endpoint"),
@@ -1,10 +1,16 @@
+import asyncio
+import hashlib
 import json
 import os
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from types import MappingProxyType
 from typing import List, Optional
 
-from google.cloud import dlp_v2
-from google.oauth2 import service_account
-from google.auth import default as google_auth_default
 from presidio_analyzer import AnalysisExplanation, EntityRecognizer, RecognizerResult
 from presidio_analyzer.nlp_engine import NlpArtifacts
 
@@ -14,6 +20,48 @@ from peekguard.utils.config import get_vault_client, get_secret_from_vault, get_
 
 logger = get_logger(__name__)
 
+# Score per dlp_v2.Likelihood value, from LIKELIHOOD_UNSPECIFIED (0) to VERY_LIKELY (5)
+_LIKELIHOOD_SCORES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Presidio entities DLP can be asked for
+_SUPPORTED_PRESIDIO_SET = frozenset(PRESIDIO_TO_DLP)
+
+# Deadline for a single inspect_content call, bounding DLP's tail latency
+DLP_TIMEOUT_S = 2.0
+
+# DLP errors swallowed during the analysis tracked by `track_dlp_failures`
+_dlp_failures: ContextVar[Optional[List[BaseException]]] = ContextVar(
+    "dlp_failures", default=None
+)
+
+
+@contextmanager
+def track_dlp_failures() -> Iterator[List[BaseException]]:
+    """
+    Collect the DLP errors swallowed by recognizers within the block.
+
+    A swallowed error leaves the results without DLP's findings, so callers
+    check the yielded list before caching them. Failures are also passed on
+    to an enclosing `track_dlp_failures`, and worker threads started through
+    `asyncio.to_thread` report into the block that started them.
+    """
+    outer = _dlp_failures.get()
+    failures: List[BaseException] = []
+    token = _dlp_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _dlp_failures.reset(token)
+        if outer is not None:
+            outer.extend(failures)
+
+
+def record_dlp_failure(error: BaseException) -> None:
+    """Report a swallowed DLP error to the enclosing `track_dlp_failures`."""
+    failures = _dlp_failures.get()
+    if failures is not None:
+        failures.append(error)
+
 
 class GoogleDlpRecognizer(EntityRecognizer):
     def __init__(
@@ -31,18 +79,24 @@ class GoogleDlpRecognizer(EntityRecognizer):
             name="Google Cloud DLP Recognizer",
         )
 
+        # google-cloud-dlp pulls in grpc and protobuf; import it only when a
+        # recognizer is actually built so importing this module stays cheap
+        from google.auth import default as google_auth_default
+        from google.cloud import dlp_v2
+
         # Authenticate to GCP
         credentials_json = get_gcp_credentials()
         self.project_id = None
+        # None lets the clients resolve application default credentials
+        self._credentials = None
 
         if credentials_json:
             try:
-                credentials_info = json.loads(credentials_json)
-                self.project_id = credentials_info.get("project_id")
-                credentials = service_account.Credentials.from_service_account_info(
-                    credentials_info
+                credentials, self.project_id, fingerprint = _credentials_from_json(
+                    credentials_json
                 )
-                self.dlp_client = dlp_v2.DlpServiceClient(credentials=credentials)
+                self.dlp_client = _shared_dlp_client(fingerprint, credentials)
+                self._credentials = credentials
                 logger.info(
                     "Initialized Google Cloud DLP client using GCP_CREDENTIALS_JSON."
                 )
@@ -51,12 +105,23 @@ class GoogleDlpRecognizer(EntityRecognizer):
                     f"Failed to initialize DLP client with GCP_CREDENTIALS_JSON: {e}. "
                     "Falling back to default credentials."
                 )
-                self.dlp_client = dlp_v2.DlpServiceClient()
+                self.dlp_client = _shared_dlp_client(None, None)
         else:
             credentials, project_id = google_auth_default()
             self.project_id = project_id
-            self.dlp_client = dlp_v2.DlpServiceClient()
+            self.dlp_client = _shared_dlp_client(None, None)
         self.parent = f"projects/{self.project_id}"
+        # Set likelihood threshold. POSSIBLE (0.6) allows broadly matching.
+        # Presidio's subsequent logic might filter by score_threshold (default usually 0.6).
+        # Resolved once: the enum lookup goes through the proto descriptor.
+        self._inspect_config_template = MappingProxyType(
+            {"include_quote": True, "min_likelihood": dlp_v2.Likelihood.POSSIBLE}
+        )
+        # The asyncio client is bound to the event loop it was created on
+        self._async_dlp_client = None
+        self._async_dlp_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Per-thread batch results being fetched, installed by `results_from`
+        self._pending = threading.local()
 
     def analyze(
         self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None
@@ -66,93 +131,315 @@ class GoogleDlpRecognizer(EntityRecognizer):
         """
         entities = entities or self.supported_entities
         results = []
-        if not text:
+        if not text or _SUPPORTED_PRESIDIO_SET.isdisjoint(entities):
             return results
 
-        # Filter entities to those supported by DLP mapping
-        dlp_info_types = []
-        for entity in entities:
-            for dlp_type in PRESIDIO_TO_DLP.get(entity, []):
-                dlp_info_types.append({"name": dlp_type}) # supports mapping one presidio entity to multiple DLP entities
+        pending = getattr(self._pending, "batch", None)
+        if pending is not None and text in pending[0]:
+            return self._pending_results(text, *pending)
 
+        dlp_info_types = self._dlp_info_types(entities)
         if not dlp_info_types:
-            logger.debug("No matching DLP infoTypes for requested entities.")
             return results
 
-        logger.info(f"Incoming entities from presidio: {entities}")
-        logger.info(f"DLP infoTypes requested: {dlp_info_types}")
-
         try:
-            item = {"value": text}
-            # Set likelihood threshold. POSSIBLE (0.6) allows broadly matching.
-            # Presidio's subsequent logic might filter by score_threshold (default usually 0.6).
-            inspect_config = {
-                "info_types": dlp_info_types,
-                "include_quote": True,
-                "min_likelihood": dlp_v2.Likelihood.POSSIBLE,
-            }
-
-            request = {
-                "parent": self.parent,
-                "inspect_config": inspect_config,
-                "item": item,
-            }
-
-            response = self.dlp_client.inspect_content(request=request)
-            # We need to handle byte-to-char offset conversion properly
-            # since DLP returns byte offsets.
-            utf8_text = text.encode("utf-8")
-
-            for finding in response.result.findings:
-                dlp_type = finding.info_type.name
-                if dlp_type in DLP_TO_PRESIDIO:
-                    presidio_entity = DLP_TO_PRESIDIO[dlp_type]
-
-                    score = self._convert_likelihood_to_score(finding.likelihood)
-
-                    start_byte = finding.location.byte_range.start
-                    end_byte = finding.location.byte_range.end
-
-                    # Convert byte offsets to character offsets
-                    start_char = len(
-                        utf8_text[:start_byte].decode("utf-8", errors="ignore")
-                    )
-                    end_char = len(
-                        utf8_text[:end_byte].decode("utf-8", errors="ignore")
-                    )
-
-                    result = RecognizerResult(
-                        entity_type=presidio_entity,
-                        start=start_char,
-                        end=end_char,
-                        score=score,
-                        analysis_explanation=AnalysisExplanation(
-                            recognizer=self.name,
-                            original_score=score,
-                            textual_explanation=f"Identified as {dlp_type} by GCP DLP",
-                        ),
-                    )
-                    results.append(result)
-                    logger.info(f"DLP raw findings count: {len(response.result.findings)}")
-                    logger.info(f"DLP mapped results count: {len(results)}")
+            response = self.dlp_client.inspect_content(
+                request=self._inspect_request(dlp_info_types, {"value": text}),
+                timeout=DLP_TIMEOUT_S,
+            )
+            results = self._to_recognizer_results(text, response.result.findings)
+            logger.info("DLP raw findings count: %d", len(response.result.findings))
+            logger.info("DLP mapped results count: %d", len(results))
 
         except Exception as e:
             logger.error(f"Error calling GCP DLP: {e}", exc_info=True)
             # Depending on policy, we might want to raise or swallow.
             # Swallowing allows other recognizers to still work.
+            record_dlp_failure(e)
 
         return results
 
-    def _convert_likelihood_to_score(self, likelihood) -> float:
-        mapping = {
-            dlp_v2.Likelihood.LIKELIHOOD_UNSPECIFIED: 0.0,
-            dlp_v2.Likelihood.VERY_UNLIKELY: 0.2,
-            dlp_v2.Likelihood.UNLIKELY: 0.4,
-            dlp_v2.Likelihood.POSSIBLE: 0.6,
-            dlp_v2.Likelihood.LIKELY: 0.8,
-            dlp_v2.Likelihood.VERY_LIKELY: 1.0,
+    async def analyze_batch_async(
+        self, texts: List[str], entities: List[str]
+    ) -> List[List[RecognizerResult]]:
+        """
+        Analyze several texts with a single request on the DLP asyncio client.
+
+        The texts are sent as the rows of a one-column table and findings are
+        routed back by row index, so N texts cost one round trip instead of N.
+        Errors propagate; `analyze` logs them when consuming the results.
+        """
+        rows, request = self._table_request(texts, entities)
+        if request is None:
+            return [[] for _ in texts]
+
+        response = await self._async_client().inspect_content(
+            request=request, timeout=DLP_TIMEOUT_S
+        )
+        return self._route_findings(texts, rows, response.result.findings)
+
+    @contextmanager
+    def results_from(
+        self, texts: List[str], future: Future[List[List[RecognizerResult]]]
+    ) -> Iterator[None]:
+        """
+        Answer `analyze` calls for `texts` from a batch still being fetched.
+
+        Within the block, `analyze` on the current thread waits for `future`
+        (an `analyze_batch_async` call) instead of calling DLP itself, so the
+        round trip overlaps the NLP pass and the other recognizers, and its
+        results still go through the analyzer's own post-processing.
+        """
+        indices = {text: index for index, text in enumerate(texts)}
+        self._pending.batch = (indices, future)
+        try:
+            yield
+        finally:
+            self._pending.batch = None
+
+    def _pending_results(
+        self,
+        text: str,
+        indices: dict[str, int],
+        future: Future[List[List[RecognizerResult]]],
+    ) -> List[RecognizerResult]:
+        try:
+            batch_results = future.result(timeout=DLP_TIMEOUT_S)
+        except Exception as e:
+            logger.error(f"Error calling GCP DLP for a batch: {e}", exc_info=True)
+            record_dlp_failure(e)
+            return []
+        return list(batch_results[indices[text]])
+
+    def _async_client(self):
+        loop = asyncio.get_running_loop()
+        if self._async_dlp_client is None or self._async_dlp_client_loop is not loop:
+            from google.cloud import dlp_v2
+            from google.cloud.dlp_v2.services.dlp_service.transports import (
+                DlpServiceGrpcAsyncIOTransport,
+            )
+
+            self._async_dlp_client = dlp_v2.DlpServiceAsyncClient(
+                credentials=self._credentials,
+                transport=_keepalive_transport(DlpServiceGrpcAsyncIOTransport),
+            )
+            self._async_dlp_client_loop = loop
+        return self._async_dlp_client
+
+    def _table_request(
+        self, texts: List[str], entities: List[str]
+    ) -> tuple[List[int], Optional[dict]]:
+        """Return the indices of the non-empty texts and their table request."""
+        entities = entities or self.supported_entities
+        rows = [index for index, text in enumerate(texts) if text]
+        if not rows or _SUPPORTED_PRESIDIO_SET.isdisjoint(entities):
+            return rows, None
+
+        dlp_info_types = self._dlp_info_types(entities)
+        if not dlp_info_types:
+            return rows, None
+
+        table = {
+            "headers": [{"name": "text"}],
+            "rows": [{"values": [{"string_value": texts[index]}]} for index in rows],
         }
-        return mapping.get(likelihood, 0.0)
+        return rows, self._inspect_request(dlp_info_types, {"table": table})
+
+    def _route_findings(
+        self, texts: List[str], rows: List[int], findings
+    ) -> List[List[RecognizerResult]]:
+        findings_by_row: dict[int, list] = {}
+        for finding in findings:
+            row = (
+                finding.location.content_locations[0]
+                .record_location.table_location.row_index
+            )
+            findings_by_row.setdefault(row, []).append(finding)
+
+        batch_results: List[List[RecognizerResult]] = [[] for _ in texts]
+        for row, row_findings in findings_by_row.items():
+            index = rows[row]
+            batch_results[index] = self._to_recognizer_results(
+                texts[index], row_findings
+            )
+
+        logger.info(
+            "DLP batch of %d texts returned %d raw findings.", len(rows), len(findings)
+        )
+        return batch_results
+
+    def _dlp_info_types(self, entities: List[str]) -> tuple[dict, ...]:
+        dlp_info_types = _dlp_info_types_for(frozenset(entities))
+        if not dlp_info_types:
+            logger.debug("No matching DLP infoTypes for requested entities.")
+            return dlp_info_types
+
+        logger.info("Incoming entities from presidio: %s", entities)
+        logger.info("DLP infoTypes requested: %s", dlp_info_types)
+        return dlp_info_types
+
+    def _inspect_request(self, dlp_info_types: tuple[dict, ...], item: dict) -> dict:
+        return {
+            "parent": self.parent,
+            "inspect_config": {
+                **self._inspect_config_template,
+                "info_types": dlp_info_types,
+            },
+            "item": item,
+        }
+
+    def _to_recognizer_results(self, text: str, findings) -> List[RecognizerResult]:
+        findings = [
+            finding
+            for finding in findings
+            if finding.info_type.name in DLP_TO_PRESIDIO
+        ]
+
+        # DLP returns byte offsets; for ASCII text (a flag CPython keeps on
+        # the string) they are the char offsets, otherwise convert them all
+        # in one pass over the text
+        char_offsets = None
+        if not text.isascii():
+            char_offsets = _byte_to_char_offsets(
+                text,
+                (
+                    offset
+                    for finding in findings
+                    for offset in (
+                        finding.location.byte_range.start,
+                        finding.location.byte_range.end,
+                    )
+                ),
+            )
+
+        results = []
+        for finding in findings:
+            dlp_type = finding.info_type.name
+            presidio_entity = DLP_TO_PRESIDIO[dlp_type]
+            likelihood = int(finding.likelihood)
+            score = (
+                _LIKELIHOOD_SCORES[likelihood]
+                if 0 <= likelihood < len(_LIKELIHOOD_SCORES)
+                else 0.0
+            )
+            byte_range = finding.location.byte_range
+            start, end = byte_range.start, byte_range.end
+            if char_offsets is not None:
+                start, end = char_offsets[start], char_offsets[end]
+
+            result = RecognizerResult(
+                entity_type=presidio_entity,
+                start=start,
+                end=end,
+                score=score,
+                analysis_explanation=AnalysisExplanation(
+                    recognizer=self.name,
+                    original_score=score,
+                    textual_explanation=f"Identified as {dlp_type} by GCP DLP",
+                ),
+            )
+            results.append(result)
+        return results
+
+
+@lru_cache(maxsize=2)
+def _credentials_from_json(credentials_json: str):
+    """
+    Return ``(credentials, project_id, fingerprint)`` for a service account JSON.
+
+    Parsing the JSON and its RSA key is repeated for every recognizer
+    otherwise; sharing the Credentials also shares their cached access token.
+    Two entries cover a key rotation in Vault.
+    """
+    from google.oauth2 import service_account
+
+    credentials_info = json.loads(credentials_json)
+    credentials = service_account.Credentials.from_service_account_info(
+        credentials_info
+    )
+    fingerprint = hashlib.sha256(credentials_json.encode()).hexdigest()
+    return credentials, credentials_info.get("project_id"), fingerprint
+
+
+# gRPC keepalive pings hold the pooled HTTP/2 connection to DLP open between
+# requests, so an idle worker does not pay a fresh TCP/TLS handshake
+DLP_CHANNEL_OPTIONS = (("grpc.keepalive_time_ms", 30000),)
+
+# DlpServiceClient per credentials fingerprint (None for application default
+# credentials), shared by every recognizer in the process
+_dlp_clients: dict = {}
+_dlp_clients_lock = threading.Lock()
+# gRPC channels do not survive a fork; a forked worker builds its own
+os.register_at_fork(after_in_child=_dlp_clients.clear)
+
+
+def _shared_dlp_client(fingerprint: Optional[str], credentials):
+    """
+    Return the process-wide DLP client for `fingerprint`, creating it once.
+
+    Each client owns a gRPC channel, so reusing it skips the channel setup
+    when recognizers are rebuilt, e.g. on analyzer re-initialisation.
+    `credentials` is only used to create a missing client.
+    """
+    with _dlp_clients_lock:
+        client = _dlp_clients.get(fingerprint)
+        if client is None:
+            from google.cloud import dlp_v2
+            from google.cloud.dlp_v2.services.dlp_service.transports import (
+                DlpServiceGrpcTransport,
+            )
+
+            client = dlp_v2.DlpServiceClient(
+                credentials=credentials,
+                transport=_keepalive_transport(DlpServiceGrpcTransport),
+            )
+            _dlp_clients[fingerprint] = client
+        return client
+
+
+def _keepalive_transport(transport_cls):
+    """Return a factory for `transport_cls` whose channel uses DLP_CHANNEL_OPTIONS."""
+    return partial(transport_cls, channel=partial(_keepalive_channel, transport_cls))
+
+
+def _keepalive_channel(transport_cls, host: str, *, options=(), **kwargs):
+    return transport_cls.create_channel(
+        host, options=[*options, *DLP_CHANNEL_OPTIONS], **kwargs
+    )
+
+
+@lru_cache(maxsize=64)
+def _dlp_info_types_for(entities: frozenset[str]) -> tuple[dict, ...]:
+    """
+    Return the DLP infoTypes covering `entities`, built once per entity set.
+
+    One presidio entity may map to multiple DLP infoTypes; names shared by
+    several entities are requested once.
+    """
+    names = {
+        dlp_type for entity in entities for dlp_type in PRESIDIO_TO_DLP.get(entity, ())
+    }
+    return tuple({"name": name} for name in sorted(names))
+
+
+def _byte_to_char_offsets(text: str, byte_offsets: Iterable[int]) -> dict[int, int]:
+    """
+    Map UTF-8 byte offsets into `text` to character offsets.
+
+    The offsets are visited in ascending order and only the bytes between two
+    consecutive offsets are decoded, so the text is decoded once in total
+    rather than once per offset.
+    """
+    utf8_text = text.encode("utf-8")
+    char_offsets: dict[int, int] = {}
+    prev_byte = prev_char = 0
+    for byte_offset in sorted(set(byte_offsets)):
+        prev_char += len(
+            utf8_text[prev_byte:byte_offset].decode("utf-8", errors="ignore")
+        )
+        prev_byte = byte_offset
+        char_offsets[byte_offset] = prev_char
+    return char_offsets
 
 
 def get_gcp_credentials():
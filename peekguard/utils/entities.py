@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 PRESIDIO_ENTITIES = [
     # Existing
     "PERSON",
@@ -19,28 +21,59 @@ PRESIDIO_ENTITIES = [
     "DEMOGRAPHIC_DATA",
 ]
 
-PRESIDIO_TO_DLP = {
-    "PERSON": ["PERSON_NAME"],
-    "EMAIL_ADDRESS": ["EMAIL_ADDRESS"],
-    "CREDIT_CARD": ["CREDIT_CARD_DATA"],
-    "PHONE_NUMBER": ["PHONE_NUMBER"],
-    "US_SSN": ["GOVERNMENT_ID"],
-    "IP_ADDRESS": ["IP_ADDRESS"],
-    "URL": ["URL"],
-    "LOCATION": ["LOCATION", "GEOGRAPHIC_DATA"],
+# Precomputed views of PRESIDIO_ENTITIES for per-request validation and defaults
+PRESIDIO_ENTITIES_SET = frozenset(PRESIDIO_ENTITIES)
+PRESIDIO_ENTITIES_DEFAULT = tuple(PRESIDIO_ENTITIES)
+
+PRESIDIO_TO_DLP = MappingProxyType({
+    "PERSON": ("PERSON_NAME",),
+    "EMAIL_ADDRESS": ("EMAIL_ADDRESS",),
+    "CREDIT_CARD": ("CREDIT_CARD_DATA",),
+    "PHONE_NUMBER": ("PHONE_NUMBER",),
+    "US_SSN": ("GOVERNMENT_ID",),
+    "IP_ADDRESS": ("IP_ADDRESS",),
+    "URL": ("URL",),
+    "LOCATION": ("LOCATION", "GEOGRAPHIC_DATA"),
     # New abstract entities
-    "GOVERNMENT_ID": ["GOVERNMENT_ID", "PASSPORT", "DRIVERS_LICENSE_NUMBER"],
-    "FINANCIAL_ID": ["FINANCIAL_ID"],
-    "TECHNICAL_ID": ["TECHNICAL_ID", "MAC_ADDRESS"],
-    "MEDICAL_ID": ["MEDICAL_ID", "MEDICAL_DATA"],
-    "SECURITY_DATA": ["SECURITY_DATA"],
-    "VEHICLE_ID": ["VEHICLE_IDENTIFICATION_NUMBER"],
-    "DEMOGRAPHIC_DATA": ["DEMOGRAPHIC_DATA"],
-}
+    "GOVERNMENT_ID": ("GOVERNMENT_ID", "PASSPORT", "DRIVERS_LICENSE_NUMBER"),
+    "FINANCIAL_ID": ("FINANCIAL_ID",),
+    "TECHNICAL_ID": ("TECHNICAL_ID", "MAC_ADDRESS"),
+    "MEDICAL_ID": ("MEDICAL_ID", "MEDICAL_DATA"),
+    "SECURITY_DATA": ("SECURITY_DATA",),
+    "VEHICLE_ID": ("VEHICLE_IDENTIFICATION_NUMBER",),
+    "DEMOGRAPHIC_DATA": ("DEMOGRAPHIC_DATA",),
+})
+
+# Reverse mapping for converting DLP results back to Presidio entities.
+# Spelled out because one DLP type may back several entities: DLP's
+# GOVERNMENT_ID is requested for both US_SSN and GOVERNMENT_ID, and its
+# findings are reported as the broader GOVERNMENT_ID.
+DLP_TO_PRESIDIO = MappingProxyType({
+    "PERSON_NAME": "PERSON",
+    "EMAIL_ADDRESS": "EMAIL_ADDRESS",
+    "CREDIT_CARD_DATA": "CREDIT_CARD",
+    "PHONE_NUMBER": "PHONE_NUMBER",
+    "IP_ADDRESS": "IP_ADDRESS",
+    "URL": "URL",
+    "LOCATION": "LOCATION",
+    "GEOGRAPHIC_DATA": "LOCATION",
+    "GOVERNMENT_ID": "GOVERNMENT_ID",
+    "PASSPORT": "GOVERNMENT_ID",
+    "DRIVERS_LICENSE_NUMBER": "GOVERNMENT_ID",
+    "FINANCIAL_ID": "FINANCIAL_ID",
+    "TECHNICAL_ID": "TECHNICAL_ID",
+    "MAC_ADDRESS": "TECHNICAL_ID",
+    "MEDICAL_ID": "MEDICAL_ID",
+    "MEDICAL_DATA": "MEDICAL_ID",
+    "SECURITY_DATA": "SECURITY_DATA",
+    "VEHICLE_IDENTIFICATION_NUMBER": "VEHICLE_ID",
+    "DEMOGRAPHIC_DATA": "DEMOGRAPHIC_DATA",
+})
 
-# Reverse mapping for converting DLP results back to Presidio entities
-DLP_TO_PRESIDIO = {
-    dlp: presidio
-    for presidio, dlps in PRESIDIO_TO_DLP.items()
-    for dlp in dlps
-}
\ No newline at end of file
+# Every requested DLP type must map back to an entity that requests it
+assert DLP_TO_PRESIDIO.keys() == {
+    dlp for dlps in PRESIDIO_TO_DLP.values() for dlp in dlps
+}, "DLP_TO_PRESIDIO does not cover exactly the DLP types in PRESIDIO_TO_DLP"
+assert all(
+    dlp in PRESIDIO_TO_DLP[presidio] for dlp, presidio in DLP_TO_PRESIDIO.items()
+), "DLP_TO_PRESIDIO maps a DLP type to an entity that does not request it"
@@ -5,7 +5,7 @@ from typing import Callable, LiteralString, ParamSpec, TypeVar
 
 from statsd.client import StatsClient
 
-from peekguard.utils.config import get_config
+from peekguard.utils.config import Environment, current_environment, get_config
 from peekguard.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -47,23 +47,31 @@ def _timing(stat_name: str, time_taken_in_ms: float, rate: int):
     logger.info("Metric '%s' took %fms", stat_name, time_taken_in_ms)
 
 
+def _timing_disabled() -> bool:
+    """statsd is never initialized on localhost, so timings there are only logged"""
+    return _statsd_client is None and current_environment() == Environment.LOCALHOST
+
+
 def timing_to_statsd_async(stat_name: LiteralString):
     """
     Decorator for async function that measures the execution time of a function and sends the timing data to StatsD.
     The decorator wraps the target async function and measures the time taken for its execution. It then sends this timing data
     to the StatsD system with the specified `stat_name`. The execution time is recorded in milliseconds.
+    On localhost, where statsd is never initialized, `func` is returned unwrapped.
     """
 
     def decorator(func: Callable[P, Awaitable[T]]):
+        if _timing_disabled():
+            return func
+
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            start_time = time.time()
+            start_time = time.perf_counter_ns()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                end_time = time.time()
-                elapsed_time_ms = (end_time - start_time) * 1000.0
+                elapsed_time_ms = (time.perf_counter_ns() - start_time) / 1e6
                 _timing(stat_name, elapsed_time_ms, rate=1)
 
         return wrapper
@@ -75,10 +83,14 @@ def timing_to_statsd_sync(stat_name: LiteralString):
     """Sends execution time (in ms) of decorated function to statsd under `stat_name`"""
 
     def decorator(func: Callable[P, T]):
+        if _timing_disabled():
+            return func
+
+        @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            start_time = time.perf_counter()
+            start_time = time.perf_counter_ns()
             result = func(*args, **kwargs)
-            elapsed_time_in_ms = (time.perf_counter() - start_time) * 1000
+            elapsed_time_in_ms = (time.perf_counter_ns() - start_time) / 1e6
             _timing(stat_name, elapsed_time_in_ms, rate=1)
             return result
 
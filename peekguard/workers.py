@@ -0,0 +1,11 @@
+from uvicorn.workers import UvicornWorker
+
+
+class PeekguardWorker(UvicornWorker):
+    """gunicorn worker serving the app on uvloop and httptools.
+
+    Matches the ``loop``/``http`` settings of ``python -m peekguard.main``,
+    which UvicornWorker would otherwise leave on "auto".
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from peekguard.main import app
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    # Run the lifespan and the ASGI portal once for the whole suite
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def client(app_client):
+    app.state.analyzer_engine = MagicMock()
+    app.state.service_initialized_successfully = True
+    yield app_client
@@ -1,20 +1,39 @@
-from unittest.mock import MagicMock, Mock, patch
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-from fastapi.testclient import TestClient
 from google.cloud import dlp_v2
+from presidio_analyzer import RecognizerResult
 
 from peekguard.api.masking.handler import (
     AddressMasker,
     PlaceholderManager,
     PresidioMasker,
+    clear_mask_caches,
     mask_sentence,
+    mask_sentence_async,
 )
 
-from peekguard.utils.dlp_recognizer import GoogleDlpRecognizer
+from peekguard.api.masking.batcher import AnalysisBatcher
+from peekguard.utils.dlp_recognizer import GoogleDlpRecognizer, record_dlp_failure
 from peekguard.main import app
 
 
+@pytest.fixture(autouse=True)
+def _empty_mask_cache():
+    clear_mask_caches()
+    yield
+    clear_mask_caches()
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_dlp_clients():
+    # Each test patches DlpServiceClient, so none may reuse another's client
+    with patch.dict("peekguard.utils.dlp_recognizer._dlp_clients", clear=True):
+        yield
+
+
 def test_placeholder_manager_initialization_empty():
     pm = PlaceholderManager(None)
     assert pm.mappings == {}
@@ -47,6 +66,45 @@ def test_placeholder_manager_placeholder_for_different_entity():
     assert placeholder == "<LOCATION_1>"
 
 
+def test_placeholder_manager_is_known_placeholder():
+    pm = PlaceholderManager({"<PERSON_1>": "John Doe"})
+    assert pm.is_known_placeholder("<PERSON_1>")
+    assert not pm.is_known_placeholder("John Doe")
+
+
+def test_placeholder_manager_mappings_is_read_only():
+    pm = PlaceholderManager(None)
+    pm.placeholder_for("PERSON", "Jane Doe")
+    with pytest.raises(TypeError):
+        pm.mappings["<PERSON_2>"] = "John Doe"  # type: ignore[index]
+
+
+def test_placeholder_manager_skips_malformed_existing_placeholders():
+    pm = PlaceholderManager(
+        {"<PERSON_2>": "Jane Roe", "<person_7>": "x", "<PERSON_>": "y", "PERSON_9": "z"}
+    )
+    assert pm.placeholder_for("PERSON", "John Doe") == "<PERSON_3>"
+    assert pm.placeholder_for("PERSON", "Jane Roe") == "<PERSON_2>"
+
+
+def test_placeholder_manager_from_owned_extends_mappings_in_place():
+    existing = {"<PERSON_1>": "Jane Roe"}
+    pm = PlaceholderManager._from_owned(existing)
+    assert pm.placeholder_for("PERSON", "John Doe") == "<PERSON_2>"
+    assert existing == {"<PERSON_1>": "Jane Roe", "<PERSON_2>": "John Doe"}
+
+    copied = {"<PERSON_1>": "Jane Roe"}
+    PlaceholderManager(copied).placeholder_for("PERSON", "John Doe")
+    assert copied == {"<PERSON_1>": "Jane Roe"}
+
+
+def test_placeholder_manager_canonicalises_existing_entities():
+    pm = PlaceholderManager({"<" + "".join(["PER", "SON"]) + "_1>": "John Doe"})
+    (entity, _), = pm._pii_to_placeholder
+    assert entity is sys.intern("PERSON")
+    assert pm.placeholder_for("PERSON", "John Doe") == "<PERSON_1>"
+
+
 @patch("peekguard.api.masking.handler.pyap.parse")
 def test_address_masker(mock_pyap_parse):
     mock_address = Mock()
@@ -62,6 +120,18 @@ def test_address_masker(mock_pyap_parse):
     assert pm.mappings["<LOCATION_1>"] == "123 Main St, Anytown, USA"
 
 
+@patch("peekguard.api.masking.handler.pyap.parse")
+def test_address_masker_multiple_addresses_spans(mock_pyap_parse):
+    text = "From 1 A St, X, CA to 22 B Ave, Y, NY."
+    first, second = Mock(), Mock()
+    first.full_address, first.match_start, first.match_end = "1 A St, X, CA", 5, 18
+    second.full_address, second.match_start, second.match_end = "22 B Ave, Y, NY", 22, 37
+    mock_pyap_parse.return_value = [first, second]
+    masked_text, spans = AddressMasker(PlaceholderManager(None)).mask(text)
+    assert masked_text == "From <LOCATION_1> to <LOCATION_2>."
+    assert [masked_text[s:e] for s, e in spans] == ["<LOCATION_1>", "<LOCATION_2>"]
+
+
 @patch("peekguard.api.masking.handler.pyap.parse")
 def test_address_masker_no_address(mock_pyap_parse):
     mock_pyap_parse.return_value = []
@@ -90,6 +160,49 @@ def test_presidio_masker():
     assert pm.mappings["<PERSON_1>"] == "John Doe"
 
 
+def test_presidio_masker_skips_excluded_spans():
+    analyzer = MagicMock()
+    results = []
+    for entity, start, end in [("PERSON", 0, 4), ("PERSON", 9, 13), ("PERSON", 18, 22)]:
+        res = MagicMock()
+        res.entity_type, res.start, res.end, res.score = entity, start, end, 0.85
+        results.append(res)
+    analyzer.analyze.return_value = results
+
+    pm = PlaceholderManager(None)
+    text = "Anna and Bill and Carl"
+    masked_text = PresidioMasker(analyzer, pm, "en").mask(
+        text, ["PERSON"], [(20, 30), (3, 5)]
+    )
+    assert masked_text == "Anna and <PERSON_1> and Carl"
+    assert pm.mappings == {"<PERSON_1>": "Bill"}
+
+
+def test_presidio_masker_analyze_reuses_cached_results():
+    analyzer = MagicMock()
+    analyzer.analyze.return_value = [MagicMock()]
+
+    masker = PresidioMasker(analyzer, PlaceholderManager(None), "en")
+    first = masker.analyze("My name is John Doe.", ["PERSON", "EMAIL_ADDRESS"])
+    second = masker.analyze("My name is John Doe.", ["EMAIL_ADDRESS", "PERSON"])
+    assert first == second
+    assert first is not second
+    assert analyzer.analyze.call_count == 1
+
+    masker.analyze("My name is John Doe.", ["PERSON"])
+    assert analyzer.analyze.call_count == 2
+
+
+def test_presidio_masker_overlap_is_strict():
+    starts, max_ends = [5], [10]
+    assert PresidioMasker._overlaps_any(4, 6, starts, max_ends)
+    assert PresidioMasker._overlaps_any(9, 12, starts, max_ends)
+    # Touching spans and empty spans do not overlap, as in max(s, ss) < min(e, ee)
+    assert not PresidioMasker._overlaps_any(0, 5, starts, max_ends)
+    assert not PresidioMasker._overlaps_any(10, 12, starts, max_ends)
+    assert not PresidioMasker._overlaps_any(7, 7, starts, max_ends)
+
+
 def test_presidio_masker_no_entities():
     analyzer = MagicMock()
     pm = PlaceholderManager(None)
@@ -123,7 +236,7 @@ def make_dlp_finding(
     return finding
 
 
-@patch("peekguard.utils.dlp_recognizer.dlp_v2.DlpServiceClient")
+@patch("google.cloud.dlp_v2.DlpServiceClient")
 def test_dlp_recognizer_passport_identification(mock_dlp_client_cls):
     mock_dlp_client = MagicMock()
     mock_dlp_client_cls.return_value = mock_dlp_client
@@ -150,6 +263,175 @@ def test_dlp_recognizer_passport_identification(mock_dlp_client_cls):
     assert text[results[0].start:results[0].end] == "A1234567"
 
 
+def _assert_keepalive_transport(transport):
+    channel = transport.keywords["channel"]
+    with patch.object(transport.func, "create_channel") as mock_create_channel:
+        channel("dlp.googleapis.com", options=[("grpc.max_send_message_length", -1)])
+    assert mock_create_channel.call_args.kwargs["options"] == [
+        ("grpc.max_send_message_length", -1),
+        ("grpc.keepalive_time_ms", 30000),
+    ]
+
+
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_dlp_recognizers_share_one_client(mock_dlp_client_cls):
+    first = GoogleDlpRecognizer(project_id="test-project")
+    second = GoogleDlpRecognizer(project_id="test-project")
+
+    assert first.dlp_client is second.dlp_client
+    assert first._credentials is second._credentials
+    mock_dlp_client_cls.assert_called_once()
+    _assert_keepalive_transport(mock_dlp_client_cls.call_args.kwargs["transport"])
+
+
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_dlp_recognizer_skips_entities_dlp_does_not_handle(mock_dlp_client_cls):
+    recognizer = GoogleDlpRecognizer(project_id="test-project")
+
+    assert recognizer.analyze("Born in 1990", ["NRP", "DATE_TIME"]) == []
+    mock_dlp_client_cls.return_value.inspect_content.assert_not_called()
+
+
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_dlp_recognizer_multibyte_offsets(mock_dlp_client_cls):
+    mock_dlp_client = MagicMock()
+    mock_dlp_client_cls.return_value = mock_dlp_client
+
+    recognizer = GoogleDlpRecognizer(project_id="test-project")
+
+    text = "Zoë 😀 passport A1234567, José’s IP 10.0.0.1"
+    findings = [
+        make_dlp_finding(info_type="IP_ADDRESS", text=text, start_char=35, end_char=43),
+        make_dlp_finding(info_type="PASSPORT", text=text, start_char=15, end_char=23),
+        make_dlp_finding(info_type="PERSON_NAME", text=text, start_char=25, end_char=29),
+    ]
+    mock_dlp_client.inspect_content.return_value = Mock(
+        result=Mock(findings=findings)
+    )
+
+    results = recognizer.analyze(text, ["GOVERNMENT_ID", "IP_ADDRESS", "PERSON"])
+
+    assert [text[r.start:r.end] for r in results] == ["10.0.0.1", "A1234567", "José"]
+
+
+@patch("google.cloud.dlp_v2.DlpServiceAsyncClient")
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_dlp_recognizer_analyze_batch_async_routes_findings_by_row(
+    mock_dlp_client_cls, mock_async_client_cls
+):
+    mock_async_client = MagicMock()
+    mock_async_client_cls.return_value = mock_async_client
+    recognizer = GoogleDlpRecognizer(project_id="test-project")
+
+    texts = ["Passport A1234567", "", "Nothing here", "IP 10.0.0.1"]
+    passport = make_dlp_finding(info_type="PASSPORT", text=texts[0], start_char=9, end_char=17)
+    passport.location.content_locations[0].record_location.table_location.row_index = 0
+    ip = make_dlp_finding(info_type="IP_ADDRESS", text=texts[3], start_char=3, end_char=11)
+    ip.location.content_locations[0].record_location.table_location.row_index = 2
+    mock_async_client.inspect_content = AsyncMock(
+        return_value=Mock(result=Mock(findings=[ip, passport]))
+    )
+
+    results = asyncio.run(
+        recognizer.analyze_batch_async(texts, ["GOVERNMENT_ID", "IP_ADDRESS"])
+    )
+
+    mock_async_client.inspect_content.assert_awaited_once()
+    _assert_keepalive_transport(mock_async_client_cls.call_args.kwargs["transport"])
+    request = mock_async_client.inspect_content.await_args.kwargs
+    assert request["timeout"] == 2.0
+    assert len(request["request"]["item"]["table"]["rows"]) == 3  # empty texts are not sent
+    assert [[texts[i][r.start:r.end] for r in res] for i, res in enumerate(results)] == [
+        ["A1234567"], [], [], ["10.0.0.1"]
+    ]
+
+
+def _batch_analyzer(recognizer, local_results=()):
+    """A mock analyzer whose batch path runs *recognizer* like AnalyzerEngine does."""
+    def analyze(text, entities, score_threshold, **_):
+        results = list(local_results) + recognizer.analyze(text, entities)
+        return [r for r in results if r.score >= score_threshold]
+
+    analyzer = MagicMock()
+    analyzer.registry.recognizers = [recognizer]
+    analyzer.nlp_engine.process_batch.side_effect = lambda texts, **_: [
+        (text, None) for text in texts
+    ]
+    analyzer.analyze.side_effect = analyze
+    return analyzer
+
+
+@patch("google.cloud.dlp_v2.DlpServiceAsyncClient")
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_analysis_batcher_fetches_dlp_findings_asynchronously(
+    mock_dlp_client_cls, mock_async_client_cls
+):
+    mock_async_client = MagicMock()
+    mock_async_client_cls.return_value = mock_async_client
+    recognizer = GoogleDlpRecognizer(project_id="test-project")
+
+    texts = ["Passport A1234567", "Passport B7654321"]
+    low = make_dlp_finding(
+        info_type="PASSPORT",
+        text=texts[0],
+        start_char=9,
+        end_char=17,
+        likelihood=dlp_v2.Likelihood.UNLIKELY,
+    )
+    low.location.content_locations[0].record_location.table_location.row_index = 0
+    high = make_dlp_finding(info_type="PASSPORT", text=texts[1], start_char=9, end_char=17)
+    high.location.content_locations[0].record_location.table_location.row_index = 1
+    mock_async_client.inspect_content = AsyncMock(
+        return_value=Mock(result=Mock(findings=[low, high]))
+    )
+    analyzer = _batch_analyzer(recognizer)
+
+    async def run():
+        batcher = AnalysisBatcher(max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(analyzer, text, "en", ["GOVERNMENT_ID"], 0.6) for text in texts)
+            )
+        finally:
+            await batcher.stop()
+
+    low_results, high_results = asyncio.run(run())
+
+    # One async round trip serves both texts; the sync client is never used
+    mock_dlp_client_cls.return_value.inspect_content.assert_not_called()
+    mock_async_client.inspect_content.assert_awaited_once()
+    # DLP findings pass through analyzer.analyze, so the score threshold applies
+    assert low_results == []
+    assert [(r.entity_type, texts[1][r.start:r.end]) for r in high_results] == [
+        ("GOVERNMENT_ID", "B7654321")
+    ]
+
+
+@patch("google.cloud.dlp_v2.DlpServiceAsyncClient")
+@patch("google.cloud.dlp_v2.DlpServiceClient")
+def test_analysis_batcher_keeps_local_results_when_dlp_fails(
+    mock_dlp_client_cls, mock_async_client_cls
+):
+    mock_async_client_cls.return_value.inspect_content = AsyncMock(
+        side_effect=RuntimeError("DLP down")
+    )
+    recognizer = GoogleDlpRecognizer(project_id="test-project")
+    local = RecognizerResult(entity_type="PERSON", start=0, end=4, score=0.85)
+    analyzer = _batch_analyzer(recognizer, [local])
+
+    async def run():
+        batcher = AnalysisBatcher()
+        batcher.start()
+        try:
+            return await batcher.submit(analyzer, "John", "en", ["PERSON"], 0.6)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [local]
+    mock_dlp_client_cls.return_value.inspect_content.assert_not_called()
+
+
 @patch("peekguard.api.masking.handler.pyap.parse")
 def test_mask_sentence(mock_pyap_parse):
     mock_address = Mock()
@@ -187,6 +469,179 @@ def test_mask_sentence_no_analyzer(mock_pyap_parse):
     assert mappings["<LOCATION_1>"] == "123 Main St, Anytown, USA"
 
 
+@patch("peekguard.api.masking.handler.pyap.parse")
+def test_mask_sentence_default_entities_skip_location_after_pyap(mock_pyap_parse):
+    mock_address = Mock()
+    mock_address.full_address = "123 Main St, Anytown, USA"
+    mock_address.match_start = 34
+    mock_address.match_end = 59
+    mock_pyap_parse.return_value = [mock_address]
+    analyzer = MagicMock()
+    analyzer.analyze.return_value = []
+
+    text = "My name is John Doe and I live at 123 Main St, Anytown, USA."
+    masked_text, _ = mask_sentence(text, analyzer, "en", None, None)
+    assert masked_text == "My name is John Doe and I live at <LOCATION_1>."
+    entities = analyzer.analyze.call_args.kwargs["entities"]
+    assert "LOCATION" not in entities
+    assert "PERSON" in entities
+
+
+@patch("peekguard.api.masking.handler.pyap.parse")
+def test_mask_sentence_async_prefers_pyap_addresses(mock_pyap_parse):
+    mock_address = Mock()
+    mock_address.full_address = "123 Main St, Anytown, USA"
+    mock_address.match_start = 34
+    mock_address.match_end = 59
+    mock_pyap_parse.return_value = [mock_address]
+
+    person, location = MagicMock(), MagicMock()
+    person.entity_type, person.start, person.end, person.score = "PERSON", 11, 19, 0.85
+    location.entity_type, location.start, location.end, location.score = "LOCATION", 46, 53, 0.9
+    analyzer = MagicMock()
+    analyzer.analyze.return_value = [person, location]
+
+    text = "My name is John Doe and I live at 123 Main St, Anytown, USA."
+    masked_text, mappings = asyncio.run(
+        mask_sentence_async(text, analyzer, "en", ["PERSON", "LOCATION"], None)
+    )
+    assert masked_text == "My name is <PERSON_1> and I live at <LOCATION_1>."
+    assert mappings == {
+        "<PERSON_1>": "John Doe",
+        "<LOCATION_1>": "123 Main St, Anytown, USA",
+    }
+    assert analyzer.analyze.call_args.kwargs["text"] == text
+
+
+def test_mask_sentence_async_serves_repeated_requests_from_cache():
+    person = MagicMock()
+    person.entity_type, person.start, person.end, person.score = "PERSON", 11, 19, 0.85
+    analyzer = MagicMock()
+    analyzer.analyze.return_value = [person]
+
+    text = "My name is John Doe."
+    first = asyncio.run(mask_sentence_async(text, analyzer, "en", ["PERSON"], None))
+    second = asyncio.run(mask_sentence_async(text, analyzer, "en", ["PERSON"], None))
+    assert first == second == ("My name is <PERSON_1>.", {"<PERSON_1>": "John Doe"})
+    assert analyzer.analyze.call_count == 1
+
+    # Different existing mappings must not share the cached result, though
+    # the analyzer output for the same text is reused
+    masked_text, mappings = asyncio.run(
+        mask_sentence_async(text, analyzer, "en", ["PERSON"], {"<PERSON_1>": "Jane Roe"})
+    )
+    assert masked_text == "My name is <PERSON_2>."
+    assert mappings == {"<PERSON_1>": "Jane Roe", "<PERSON_2>": "John Doe"}
+    assert analyzer.analyze.call_count == 1
+
+
+def test_mask_sentence_async_does_not_cache_results_after_dlp_failure():
+    person = RecognizerResult(entity_type="PERSON", start=11, end=19, score=0.85)
+    calls = []
+
+    def analyze(**_):
+        calls.append(None)
+        if len(calls) == 1:
+            record_dlp_failure(RuntimeError("DLP down"))
+            return []
+        return [person]
+
+    analyzer = MagicMock()
+    analyzer.analyze.side_effect = analyze
+
+    text = "My name is John Doe."
+    degraded = asyncio.run(mask_sentence_async(text, analyzer, "en", ["PERSON"], None))
+    retried = asyncio.run(mask_sentence_async(text, analyzer, "en", ["PERSON"], None))
+
+    assert degraded == (text, {})
+    assert retried == ("My name is <PERSON_1>.", {"<PERSON_1>": "John Doe"})
+    assert len(calls) == 2
+
+
+def test_mask_sentence_cache_keeps_existing_mappings_order():
+    existing = {"<PERSON_1>": "Jane Roe", "<EMAIL_ADDRESS_1>": "jane@example.com"}
+    reordered = dict(reversed(existing.items()))
+
+    _, mappings = mask_sentence("Hello there", None, "en", ["PERSON"], existing)
+    _, reordered_mappings = mask_sentence("Hello there", None, "en", ["PERSON"], reordered)
+    assert list(mappings) == list(existing)
+    assert list(reordered_mappings) == list(reordered)
+
+
+def test_mask_sentence_skips_presidio_for_pii_free_text():
+    analyzer = MagicMock()
+    masked_text, mappings = mask_sentence("?! :)", analyzer, "en", ["PERSON"], None)
+    assert (masked_text, dict(mappings)) == ("?! :)", {})
+    masked_text, _ = mask_sentence("...", analyzer, "en", ["PERSON"], None)
+    assert masked_text == "..."
+    analyzer.analyze.assert_not_called()
+
+
+def test_mask_sentence_analyzes_only_possible_entities():
+    analyzer = MagicMock()
+    analyzer.analyze.return_value = []
+    mask_sentence(
+        "Call John", analyzer, "en", ["PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS"], None
+    )
+    assert analyzer.analyze.call_args.kwargs["entities"] == ["PERSON"]
+
+
+@patch("peekguard.api.masking.batcher._run_batch")
+def test_analysis_batcher_coalesces_concurrent_requests(mock_run_batch):
+    mock_run_batch.side_effect = lambda analyzer, texts, *_: [[text] for text in texts]
+    analyzer = MagicMock()
+
+    async def run():
+        batcher = AnalysisBatcher(max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit(analyzer, "a", "en", ["PERSON"], 0.6),
+                batcher.submit(analyzer, "b", "en", ["PERSON"], 0.6),
+                batcher.submit(analyzer, "c", "en", ["URL"], 0.6),
+            )
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [["a"], ["b"], ["c"]]
+    batches = sorted(call.args[1] for call in mock_run_batch.call_args_list)
+    assert batches == [["a", "b"], ["c"]]
+
+
+@patch("peekguard.api.masking.batcher._run_batch")
+def test_analysis_batcher_propagates_errors(mock_run_batch):
+    mock_run_batch.side_effect = ValueError("boom")
+
+    async def run():
+        batcher = AnalysisBatcher()
+        batcher.start()
+        try:
+            await batcher.submit(MagicMock(), "a", "en", ["PERSON"], 0.6)
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run())
+
+
+@patch("peekguard.api.masking.batcher._run_batch")
+def test_analysis_batcher_fails_requests_missing_from_results(mock_run_batch):
+    mock_run_batch.return_value = []
+
+    async def run():
+        batcher = AnalysisBatcher()
+        batcher.start()
+        try:
+            return await asyncio.wait_for(
+                batcher.submit(MagicMock(), "a", "en", ["PERSON"], 0.6), timeout=5
+            )
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
 def test_mask_sentence_empty_sentence():
     masked_text, mappings = mask_sentence("", None, "en", [], None)
     assert masked_text == ""
@@ -198,14 +653,6 @@ def test_mask_sentence_invalid_entities():
         mask_sentence("some text", None, "en", ["INVALID_ENTITY"], None)
 
 
-
-@pytest.fixture
-def client():
-    with TestClient(app) as c:
-        app.state.analyzer_engine = MagicMock()
-        app.state.service_initialized_successfully = True
-        yield c
-
 def test_get_analyzer_engine_dependency_success(client):
     response = client.post("/mask", json={"text_data": "test"})
     assert response.status_code != 503
@@ -225,7 +672,7 @@ def test_get_analyzer_engine_dependency_no_analyzer(client):
     assert "AnalyzerEngine not available" in response.text
     app.state.analyzer_engine = original_analyzer
 
-@patch("peekguard.api.masking.router.mask_sentence")
+@patch("peekguard.api.masking.router.mask_sentence_async")
 def test_mask_pii_data_success(mock_mask_sentence, client):
     mock_mask_sentence.return_value = ("masked text", {"<PERSON_1>": "John Doe"})
     response = client.post(
@@ -240,4 +687,31 @@ def test_mask_pii_data_success(mock_mask_sentence, client):
     assert response.json() == {
         "masked_data": "masked text",
         "mappings": {"<PERSON_1>": "John Doe"},
-    }
\ No newline at end of file
+    }
+
+def test_mask_pii_data_invalid_body(client):
+    response = client.post("/mask", json={"language": "en"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "text_data"]
+
+    response = client.post(
+        "/mask", content=b"{not json", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+def test_mask_pii_data_invalid_body_when_not_ready(client):
+    app.state.service_initialized_successfully = False
+    try:
+        with patch("peekguard.api.masking.router.send_alert") as mock_send_alert:
+            response = client.post("/mask", json={"language": "en"})
+    finally:
+        app.state.service_initialized_successfully = True
+    assert response.status_code == 422
+    mock_send_alert.assert_not_called()
+
+
+def test_mask_pii_data_openapi_documents_request_body(client):
+    operation = client.get("/openapi.json").json()["paths"]["/mask"]["post"]
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert "text_data" in schema["properties"]
@@ -4,9 +4,7 @@ from fastapi.testclient import TestClient
 
 from peekguard.main import app
 
-client = TestClient(app)
-
-def test_read_root():
+def test_read_root(client):
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"message": "Welcome to PeekGuard FastAPI!"}
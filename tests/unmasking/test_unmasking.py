@@ -1,11 +1,22 @@
+import importlib
+from unittest.mock import patch
+
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from peekguard.api.unmasking.router import _unmask_sentence
+import peekguard.api.unmasking.router as unmasking_router_module
+from peekguard.api.unmasking.router import UNMASK_BATCH_MAX_ITEMS, _unmask_sentence
 from peekguard.api.unmasking.schema import UnmaskRequest, UnmaskResponse
-from peekguard.main import app
 
-client = TestClient(app)
+
+def _post_unmask(client, payload: UnmaskRequest):
+    # Serialized once in pydantic-core rather than model_dump() + json.dumps
+    return client.post(
+        "/unmask",
+        content=payload.model_dump_json(),
+        headers={"Content-Type": "application/json"},
+    )
 
 
 # Test cases for _unmask_sentence function
@@ -15,6 +26,8 @@ client = TestClient(app)
         ("", {}, ""),
         ("Hello <PERSON_1>", {}, "Hello <PERSON_1>"),
         ("", {"<PERSON_1>": "World"}, ""),
+        ("<PERSON_1> and <PERSON_1>", {"<PERSON_1>": "Jo"}, "Jo and Jo"),
+        ("aaa", {"aa": "b"}, "ba"),
         (
             "User: <PERSON_1>, Email: <EMAIL_ADDRESS_1>",
             {"<PERSON_1>": "John Doe", "<EMAIL_ADDRESS_1>": "john.doe@example.com"},
@@ -55,8 +68,27 @@ def test_unmask_sentence(masked_data, mappings, expected_output):
     assert _unmask_sentence(masked_data, mappings) == expected_output
 
 
+def test_unmask_sentence_does_not_rescan_restored_values():
+    masked_data = "<PERSON_1> and <PERSON_2>"
+    mappings = {"<PERSON_1>": "<PERSON_2>", "<PERSON_2>": "Jane Roe"}
+    assert _unmask_sentence(masked_data, mappings) == "<PERSON_2> and Jane Roe"
+
+
+def test_unmask_sentence_handles_non_placeholder_keys():
+    masked_data = "<<PERSON_1>> met [REDACTED] at <UNKNOWN_1>"
+    mappings = {"<PERSON_1>": "Jane Roe", "[REDACTED]": "John Doe"}
+    assert (
+        _unmask_sentence(masked_data, mappings)
+        == "<Jane Roe> met John Doe at <UNKNOWN_1>"
+    )
+    assert (
+        _unmask_sentence(masked_data, {"<PERSON_1>": "Jane Roe"})
+        == "<Jane Roe> met [REDACTED] at <UNKNOWN_1>"
+    )
+
+
 # Test cases for /unmask API endpoint
-def test_unmask_api_success():
+def test_unmask_api_success(client):
     request_payload = UnmaskRequest(
         masked_data="My email is <EMAIL_ADDRESS_1> and name is <PERSON_1>. My IP is <IP_ADDRESS_1>",
         mappings={
@@ -65,7 +97,7 @@ def test_unmask_api_success():
             "<IP_ADDRESS_1>": "127.0.0.1",
         },
     )
-    response = client.post("/unmask", json=request_payload.model_dump())
+    response = _post_unmask(client, request_payload)
     assert response.status_code == 200
     response_data = UnmaskResponse(**response.json())
     assert (
@@ -74,37 +106,121 @@ def test_unmask_api_success():
     )
 
 
-def test_unmask_api_empty_masked_data():
+def test_unmask_api_empty_masked_data(client):
     request_payload = UnmaskRequest(masked_data="", mappings={"<NAME>": "Test"})
-    response = client.post("/unmask", json=request_payload.model_dump())
+    response = _post_unmask(client, request_payload)
     assert response.status_code == 200
     response_data = UnmaskResponse(**response.json())
     assert response_data.unmasked_data == ""
 
 
-def test_unmask_api_empty_mappings():
+def test_unmask_api_empty_mappings(client):
     request_payload = UnmaskRequest(masked_data="Hello <NAME>", mappings={})
-    response = client.post("/unmask", json=request_payload.model_dump())
+    response = _post_unmask(client, request_payload)
     assert response.status_code == 200
     response_data = UnmaskResponse(**response.json())
     assert response_data.unmasked_data == "Hello <NAME>"
 
 
-def test_unmask_api_no_placeholders_in_data():
+def test_unmask_api_no_placeholders_in_data(client):
     request_payload = UnmaskRequest(
         masked_data="Hello World", mappings={"<NAME>": "Test"}
     )
-    response = client.post("/unmask", json=request_payload.model_dump())
+    response = _post_unmask(client, request_payload)
     assert response.status_code == 200
     response_data = UnmaskResponse(**response.json())
     assert response_data.unmasked_data == "Hello World"
 
 
-def test_unmask_api_placeholder_not_in_mappings():
+def test_unmask_api_placeholder_not_in_mappings(client):
     request_payload = UnmaskRequest(
         masked_data="Hello <UNKNOWN>", mappings={"<NAME>": "Test"}
     )
-    response = client.post("/unmask", json=request_payload.model_dump())
+    response = _post_unmask(client, request_payload)
     assert response.status_code == 200
     response_data = UnmaskResponse(**response.json())
     assert response_data.unmasked_data == "Hello <UNKNOWN>"
+
+
+def test_unmask_api_invalid_body(client):
+    response = client.post("/unmask", json={"masked_data": "Hello <NAME>"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "mappings"]
+
+    response = client.post(
+        "/unmask", content=b"{not json", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+def test_unmask_api_plain_text(client):
+    request_payload = UnmaskRequest(
+        masked_data='Say "hi" to <PERSON_1>', mappings={"<PERSON_1>": "Jane"}
+    )
+    response = client.post(
+        "/unmask",
+        content=request_payload.model_dump_json(),
+        headers={"Content-Type": "application/json", "Accept": "text/plain"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == 'Say "hi" to Jane'
+
+    response = _post_unmask(client, request_payload)
+    assert response.json() == {"unmasked_data": 'Say "hi" to Jane'}
+
+
+def test_unmask_batch_api_success(client):
+    response = client.post(
+        "/unmask/batch",
+        json=[
+            {"masked_data": "Hi <PERSON_1>", "mappings": {"<PERSON_1>": "Jane"}},
+            {"masked_data": "", "mappings": {}},
+            {
+                "masked_data": "<PERSON_1> <EMAIL_ADDRESS_1>",
+                "mappings": {"<PERSON_1>": "Jo", "<EMAIL_ADDRESS_1>": "jo@example.com"},
+            },
+        ],
+    )
+    assert response.status_code == 200
+    assert [UnmaskResponse(**item).unmasked_data for item in response.json()] == [
+        "Hi Jane",
+        "",
+        "Jo jo@example.com",
+    ]
+
+
+def test_unmask_batch_api_invalid_body(client):
+    response = client.post("/unmask/batch", json=[{"masked_data": "Hi"}])
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 0, "mappings"]
+
+
+def test_unmask_batch_api_rejects_too_many_items(client):
+    item = {"masked_data": "Hi <PERSON_1>", "mappings": {"<PERSON_1>": "Jane"}}
+    response = client.post("/unmask/batch", json=[item] * UNMASK_BATCH_MAX_ITEMS)
+    assert response.status_code == 200
+
+    response = client.post("/unmask/batch", json=[item] * (UNMASK_BATCH_MAX_ITEMS + 1))
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+def test_unmask_batch_api_reports_timing():
+    # Timing is disabled on localhost when routes are decorated, so rebuild the
+    # router with it enabled and serve it from a throwaway app
+    try:
+        with patch("peekguard.utils.metrics._timing_disabled", return_value=False):
+            router_module = importlib.reload(unmasking_router_module)
+        test_app = FastAPI()
+        test_app.include_router(router_module.unmasking_router)
+        with patch("peekguard.utils.metrics._timing") as mock_timing:
+            response = TestClient(test_app).post(
+                "/unmask/batch", json=[{"masked_data": "Hi", "mappings": {}}]
+            )
+    finally:
+        importlib.reload(unmasking_router_module)
+
+    assert response.status_code == 200
+    mock_timing.assert_called_once()
+    assert mock_timing.call_args.args[0] == "peekguard.api.unmasking.batch"